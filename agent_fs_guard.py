@@ -5,7 +5,7 @@ Minimal permission guard & audit layer for my local AI agents (Jenny, Luna, Demo
 - Enforces per-agent allowed operations (read/write/network/exec).
 - Enforces allowed path roots (prevents wandering outside project).
 - Optional domain allowlist for network calls.
-- Simple audit log of every checked action.
+- Simple audit log: one entry per can_* check, plus completed writes.
 
 Usage:
     from agent_fs_guard import Guard, GuardTokenError
@@ -19,9 +19,10 @@ CLI:
     python agent_fs_guard.py --test
 """
 from __future__ import annotations
-import os, sys, time, json, re
+import os, sys, time, json, re, atexit, threading, mmap
+from collections import deque
 from pathlib import Path
-from typing import Iterable, Dict, Any
+from typing import Dict, Any, Iterable, Tuple
 from urllib.parse import urlparse
 
 # =========================
@@ -40,6 +41,8 @@ class GuardPermissionError(Exception):
 HOME = str(Path.home())
 DEFAULT_AUDIT_DIR = f"{HOME}/Documents/Updated_Relay_Files"
 AUDIT_LOG = Path(DEFAULT_AUDIT_DIR) / "guardian_audit.log"
+AUDIT_BATCH_SIZE = 64          # wake the flusher early once this many lines are queued
+AUDIT_FLUSH_INTERVAL = 0.1     # seconds between background flushes
 
 POLICY: Dict[str, Dict[str, Any]] = {
     # Base defaults for any agent not explicitly listed
@@ -92,35 +95,110 @@ POLICY: Dict[str, Dict[str, Any]] = {
     },
 }
 
-EXCLUDES = {".git", ".venv", "__pycache__", "node_modules", ".DS_Store"}
+EXCLUDES = (".git", ".venv", "__pycache__", "node_modules", ".DS_Store")
 
-def _resolve(p: Path) -> Path:
+def _canon(p: str) -> str:
+    """realpath, resolved on every check; caching it would keep a path allowed after a symlink swap."""
     try:
-        return p.expanduser().resolve(strict=False)
+        return os.path.realpath(os.path.expanduser(p))
     except Exception:
-        return p.expanduser()
+        return os.path.expanduser(p)
 
-def _is_within(path: Path, root: Path) -> bool:
-    path = _resolve(path)
-    root = _resolve(root)
-    return root == path or root in path.parents
+def _root_prefixes(roots: Iterable[str]) -> Tuple[str, ...]:
+    """Resolve policy roots once into sep-terminated prefixes for startswith()."""
+    out = []
+    for r in roots:
+        r = _canon(r)
+        out.append(r if r.endswith(os.sep) else r + os.sep)
+    return tuple(out)
 
-def _matches_any_root(path: Path, roots: Iterable[str]) -> bool:
-    return any(_is_within(path, Path(r)) for r in roots)
+def _is_within(path: str, prefixes: Tuple[str, ...]) -> bool:
+    # `path` must already be resolved; the trailing sep makes the root itself match
+    return (path + os.sep).startswith(prefixes)
 
-def _audit_write(entry: Dict[str, Any]) -> None:
+_EXCLUDES_WITH_SEPS = tuple(f"{os.sep}{e}{os.sep}" for e in EXCLUDES)
+
+def _is_excluded(path: str) -> bool:
+    wrapped = f"{os.sep}{os.path.normpath(path)}{os.sep}"
+    return any(e in wrapped for e in _EXCLUDES_WITH_SEPS)
+
+# Audit lines go through orjson when installed (C encoder); stdlib otherwise
+try:
+    import orjson  # pip install orjson
+    def _dumps(entry: Dict[str, Any]) -> str:
+        return orjson.dumps(entry).decode()
+except ImportError:
+    def _dumps(entry: Dict[str, Any]) -> str:
+        return json.dumps(entry, ensure_ascii=False)
+
+# ---- Batched audit writer ----
+# Checks only enqueue a serialized line; a daemon thread appends the queue to
+# AUDIT_LOG in one write every AUDIT_FLUSH_INTERVAL (or sooner when full).
+_audit_queue: deque = deque()
+_audit_cond = threading.Condition()
+_audit_io_lock = threading.Lock()
+
+def _audit_flush() -> None:
+    batch = []
+    while True:
+        try:
+            batch.append(_audit_queue.popleft())
+        except IndexError:
+            break
+    if not batch:
+        return
     try:
-        AUDIT_LOG.parent.mkdir(parents=True, exist_ok=True)
-        with open(AUDIT_LOG, "a") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        with _audit_io_lock:
+            AUDIT_LOG.parent.mkdir(parents=True, exist_ok=True)
+            with open(AUDIT_LOG, "a") as f:
+                f.write("\n".join(batch) + "\n")
     except Exception:
         pass
 
+def _audit_flusher() -> None:
+    while True:
+        with _audit_cond:
+            _audit_cond.wait(timeout=AUDIT_FLUSH_INTERVAL)
+        _audit_flush()
+
+def _audit_write(entry: Dict[str, Any]) -> None:
+    try:
+        _audit_queue.append(_dumps(entry))
+    except Exception:
+        return
+    if len(_audit_queue) >= AUDIT_BATCH_SIZE:
+        with _audit_cond:
+            _audit_cond.notify()
+
+threading.Thread(target=_audit_flusher, name="guard-audit-flush", daemon=True).start()
+atexit.register(_audit_flush)
+
+# Per-policy (allowed_prefixes, denied_prefixes, allowed_domains), shared by all Guards
+_RESOLVED_POLICY: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...], frozenset]] = {}
+
+def _resolve_policy(agent_key: str) -> Tuple[Tuple[str, ...], Tuple[str, ...], frozenset]:
+    resolved = _RESOLVED_POLICY.get(agent_key)
+    if resolved is None:
+        policy = POLICY[agent_key]
+        resolved = (
+            _root_prefixes(policy["allowed_roots"]),
+            _root_prefixes(policy["denied_roots"]),
+            frozenset(d.lower() for d in policy.get("allowed_domains", [])),
+        )
+        _RESOLVED_POLICY[agent_key] = resolved
+    return resolved
+
 class Guard:
     def __init__(self, agent: str = "_default"):
         self.agent = agent if agent in POLICY else "_default"
         self.policy = POLICY[self.agent]
-        self.now = lambda: int(time.time())
+        self.now = time.time_ns  # integer ns: orders events within a batched flush
+        self._allowed_prefixes, self._denied_prefixes, self._allowed_domains = _resolve_policy(self.agent)
+        # most agent policies have no denied roots; skip that match entirely for them
+        if self._denied_prefixes:
+            self._check_path = self._check_path_with_deny
+        else:
+            self._check_path = self._check_path_allow_only
 
     def _audit(self, action: str, target: str, allowed: bool, extra: Dict[str, Any] = None):
         entry = {
@@ -133,39 +211,44 @@ class Guard:
         if extra: entry.update(extra)
         _audit_write(entry)
 
-    # ---- permission checks ----
+    # ---- permission checks (pure; auditing happens once in _can) ----
     def _check_op(self, op: str) -> bool:
-        ok = op in self.policy["allowed_ops"]
-        self._audit("check_op", op, ok)
-        return ok
+        return op in self.policy["allowed_ops"]
 
-    def _check_path(self, path: str) -> bool:
-        p = Path(path)
-        if any(part in EXCLUDES for part in p.parts):
-            self._audit("check_path_excluded", path, False)
-            return False
-        allowed = _matches_any_root(p, self.policy["allowed_roots"])
-        denied = _matches_any_root(p, self.policy["denied_roots"])
-        ok = allowed and not denied
-        self._audit("check_path", path, ok, {"allowed": allowed, "denied": denied})
-        return ok
+    # _check_path is bound to one of these in __init__
+    def _check_path_with_deny(self, path: str) -> Tuple[bool, Dict[str, Any]]:
+        if _is_excluded(path):
+            return False, {"excluded": True}
+        p = _canon(path)
+        allowed = _is_within(p, self._allowed_prefixes)
+        denied = _is_within(p, self._denied_prefixes)
+        return allowed and not denied, {"in_allowed_root": allowed, "in_denied_root": denied}
+
+    def _check_path_allow_only(self, path: str) -> Tuple[bool, Dict[str, Any]]:
+        if _is_excluded(path):
+            return False, {"excluded": True}
+        allowed = _is_within(_canon(path), self._allowed_prefixes)
+        return allowed, {"in_allowed_root": allowed, "in_denied_root": False}
+
+    def _check_domain(self, url: str) -> Tuple[bool, Dict[str, Any]]:
+        host = urlparse(url).netloc.partition(":")[0].lower()
+        return host in self._allowed_domains, {"host": host}
 
-    def _check_domain(self, url: str) -> bool:
-        host = urlparse(url).netloc.split(":")[0].lower()
-        allowed_domains = [d.lower() for d in self.policy["allowed_domains"]]
-        ok = host in allowed_domains
-        self._audit("check_domain", host, ok)
+    def _can(self, op: str, target: str, check) -> bool:
+        op_ok = self._check_op(op)
+        ok, detail = check(target) if op_ok else (False, {})
+        self._audit(f"can_{op}", target, ok, {"op_ok": op_ok, **detail})
         return ok
 
     # ---- public can_* ----
     def can_read(self, path: str) -> bool:
-        return self._check_op("read") and self._check_path(path)
+        return self._can("read", path, self._check_path)
 
     def can_write(self, path: str) -> bool:
-        return self._check_op("write") and self._check_path(path)
+        return self._can("write", path, self._check_path)
 
     def can_network(self, url: str) -> bool:
-        return self._check_op("network") and self._check_domain(url)
+        return self._can("network", url, self._check_domain)
 
     # ---- safe helpers that enforce & raise ----
     def read_text(self, path: str, encoding: str = "utf-8") -> str:
@@ -182,23 +265,71 @@ class Guard:
         self._audit("write_text", str(p), True, {"bytes": len(data)})
 
 # ---- very basic secret scanner helper (optional import) ----
+# re.ASCII: keys are plain ASCII, so skip Unicode classes/case folding
 SECRET_PATTERNS = [
-    re.compile(r"sk-[A-Za-z0-9]{20,}"),                  # OpenAI-like
-    re.compile(r"AKIA[0-9A-Z]{16}"),                     # AWS
-    re.compile(r"AIza[0-9A-Za-z\-_]{35}"),               # Google
-    re.compile(r"anthropic_[a-z]{2}_[A-Za-z0-9_-]{20,}"),# Anthropic-ish
-    re.compile(r"(?i)(api[_-]?key|token|secret)\s*[:=]\s*[\"'][^\"']+[\"']"),
+    re.compile(r"sk-[A-Za-z0-9]{20,}", re.ASCII),                   # OpenAI-like
+    re.compile(r"AKIA[0-9A-Z]{16}", re.ASCII),                      # AWS
+    re.compile(r"AIza[0-9A-Za-z\-_]{35}", re.ASCII),                # Google
+    re.compile(r"anthropic_[a-z]{2}_[A-Za-z0-9_-]{20,}", re.ASCII), # Anthropic-ish
+    re.compile(r"(?i:api[_-]?key|token|secret)\s*[:=]\s*[\"'][^\"']+[\"']", re.ASCII),
 ]
+# One alternation = one pass over the input; the bytes twin scans files undecoded
+_SECRET_UNION = re.compile("|".join(f"(?:{p.pattern})" for p in SECRET_PATTERNS), re.ASCII)
+_SECRET_UNION_BYTES = re.compile(_SECRET_UNION.pattern.encode(), re.ASCII)
+
+# ---- optional single-pass multi-pattern engines (hyperscan, else RE2 Set) ----
+def _hyperscan_scanner():
+    import hyperscan  # pip install hyperscan
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[p.pattern.encode() for p in SECRET_PATTERNS],
+        ids=list(range(len(SECRET_PATTERNS))),
+        elements=len(SECRET_PATTERNS),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(SECRET_PATTERNS),
+    )
+
+    def scan(data: bytes) -> bool:
+        hits = []
+        db.scan(data, match_event_handler=lambda *_: hits.append(True))
+        return bool(hits)
+    return scan
+
+def _re2_scanner():
+    import re2  # pip install google-re2
+    rs = re2.Set.SearchSet(re2.Options())
+    for p in SECRET_PATTERNS:
+        rs.Add(p.pattern)
+    rs.Compile()
+    return lambda data: bool(rs.Match(data))
+
+def _build_secret_scanner():
+    for build in (_hyperscan_scanner, _re2_scanner):
+        try:
+            return build()
+        except Exception:
+            pass
+    return None
+
+_SECRET_SCAN = _build_secret_scanner()
 
 def scan_text_for_secrets(text: str) -> bool:
-    return any(p.search(text) for p in SECRET_PATTERNS)
+    if _SECRET_SCAN is not None:
+        return _SECRET_SCAN(text.encode("utf-8", "ignore"))
+    return _SECRET_UNION.search(text) is not None
 
 def scan_file_for_secrets(path: str) -> bool:
+    """Match against the whole file: the generic token/secret pattern has no length bound,
+    so chunked windows could split a match. The re path searches an mmap rather than a copy."""
     try:
-        data = Path(path).read_text(errors="ignore")
+        if _SECRET_SCAN is not None:
+            return _SECRET_SCAN(Path(path).read_bytes())
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _SECRET_UNION_BYTES.search(mm) is not None
     except Exception:
         return False
-    return scan_text_for_secrets(data)
 
 def _self_test() -> int:
     g = Guard("Jenny")
@@ -209,6 +340,7 @@ def _self_test() -> int:
         ok2 = True
     except Exception:
         ok2 = False
+    _audit_flush()
     print("read_check:", ok1, "write_check:", ok2, "audit:", AUDIT_LOG)
     return 0 if (ok1 and ok2) else 1
 
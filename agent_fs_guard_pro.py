@@ -2,6 +2,9 @@
 Agent FS Guard (PRO)
 - Local, file-backed capability tokens with audit log + countdown helper.
 - Atomic saves; optional file lock if `filelock` is installed.
+- Audit lines are queued in memory and appended in batches by a daemon thread.
+- Token reads are cached until the file changes; issue/revoke write through.
+- State files are stored as compact JSON.
 
 Public API (compatible with regular):
 - list_agents() -> list[str]
@@ -14,7 +17,9 @@ Public API (compatible with regular):
 - DEFAULT_SCOPES: set[str] = {"read","write","list"}
 """
 from __future__ import annotations
-import json, uuid, os
+import json, uuid, os, time, atexit, threading
+from collections import deque
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta, timezone
@@ -50,6 +55,8 @@ except Exception:  # graceful fallback
 # ---------- Defaults ----------
 DEFAULT_SCOPES: Set[str] = {"read", "write", "list"}
 DEFAULT_TTL_MIN = 30
+AUDIT_BATCH_SIZE = 64
+AUDIT_FLUSH_INTERVAL = 0.1  # seconds
 
 # ---------- Time helpers ----------
 
@@ -64,8 +71,10 @@ def _iso(dt: datetime) -> str:
 # ---------- IO helpers ----------
 
 def _atomic_write_json(path: Path, data) -> None:
+    # compact on disk; for a readable copy use `python -m json.tool <file>`
     tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+    text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    tmp.write_text(text, encoding="utf-8")
     tmp.replace(path)
 
 
@@ -87,16 +96,82 @@ def _with_lock(fn):
     return wrapper
 
 
+# ---------- Optional fast JSON for audit lines ----------
+try:
+    import orjson  # pip install orjson
+    def _dumps(entry: Dict) -> str:
+        return orjson.dumps(entry).decode()
+except ImportError:
+    def _dumps(entry: Dict) -> str:
+        return json.dumps(entry, ensure_ascii=False)
+
+
 # ---------- Audit ----------
-@_with_lock
+# The log is opened once with O_APPEND, so every write lands at the current
+# end of file. POSIX only guarantees atomic appends up to PIPE_BUF (pipes), and
+# a batch can be larger or be written short, so batches from other processes
+# could interleave; the optional file lock is held per batch to prevent that.
+_audit_queue: deque = deque()
+_audit_cond = threading.Condition()
+_audit_io_lock = threading.Lock()  # serializes the flusher thread and atexit
+_audit_fd: Optional[int] = None
+
+
+def _audit_flush() -> None:
+    global _audit_fd
+    batch = []
+    while True:
+        try:
+            batch.append(_audit_queue.popleft())
+        except IndexError:
+            break
+    if not batch:
+        return
+    buf = memoryview(("\n".join(batch) + "\n").encode("utf-8"))
+    try:
+        with _audit_io_lock, (_LOCK or nullcontext()):
+            if _audit_fd is None:
+                _audit_fd = os.open(AUDIT_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            while buf:  # os.write may write only part of the buffer
+                buf = buf[os.write(_audit_fd, buf):]
+    except Exception:
+        pass
+
+
+def _audit_close() -> None:
+    """atexit: write what is still queued, then close the log fd."""
+    global _audit_fd
+    _audit_flush()
+    with _audit_io_lock:
+        if _audit_fd is not None:
+            try:
+                os.close(_audit_fd)
+            except OSError:
+                pass
+            _audit_fd = None
+
+
+def _audit_flusher() -> None:
+    while True:
+        with _audit_cond:
+            _audit_cond.wait(timeout=AUDIT_FLUSH_INTERVAL)
+        _audit_flush()
+
+
 def _audit(event: str, **meta):
+    # deque.append is atomic, so the hot path takes no lock at all
     try:
         meta = {k: (v if isinstance(v, (str, int, float)) else str(v)) for k, v in meta.items()}
-        line = json.dumps({"ts": _iso(_now()), "event": event, **meta}, ensure_ascii=False)
-        with AUDIT_PATH.open("a", encoding="utf-8") as fh:
-            fh.write(line + "\n")
+        _audit_queue.append(_dumps({"ts": _iso(_now()), "event": event, **meta}))
     except Exception:
-        pass
+        return
+    if len(_audit_queue) >= AUDIT_BATCH_SIZE:
+        with _audit_cond:
+            _audit_cond.notify()
+
+
+threading.Thread(target=_audit_flusher, name="guard-pro-audit-flush", daemon=True).start()
+atexit.register(_audit_close)
 
 
 # ---------- Agent registry ----------
@@ -143,21 +218,53 @@ def register_agent(agent_name: str, notes: str = "") -> None:
 
 # ---------- Tokens ----------
 
-def _load_tokens() -> Dict[str, Dict]:
-    return _load_json(TOKENS_PATH, {})
+# Read cache: the parsed file is reused until its (mtime_ns, size) changes, so
+# other processes' issues and revocations are picked up on the next read.
+# Mutators reread the file under the locks, write a new dict synchronously and
+# never modify a dict that has been handed out.
+_tokens_cache = {"data": None, "stamp": None}
+_tokens_lock = threading.RLock()  # in-process counterpart of the optional file lock
+
+
+def _tokens_stamp() -> Optional[Tuple[int, int]]:
+    try:
+        st = TOKENS_PATH.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_tokens(fresh: bool = False) -> Dict[str, Dict]:
+    """Token dict (read-only; copy before changing). fresh=True always rereads the file."""
+    with _tokens_lock:
+        stamp = _tokens_stamp()
+        if fresh or _tokens_cache["data"] is None or stamp != _tokens_cache["stamp"]:
+            _tokens_cache["data"] = _load_json(TOKENS_PATH, {})
+            _tokens_cache["stamp"] = stamp
+        return _tokens_cache["data"]
 
 
 @_with_lock
 def _save_tokens(tokens: Dict[str, Dict]) -> None:
-    _atomic_write_json(TOKENS_PATH, tokens)
+    with _tokens_lock:
+        _atomic_write_json(TOKENS_PATH, tokens)
+        # reparse on the next read rather than trusting a stamp taken after the write
+        _tokens_cache["data"] = None
+
+
+def _expires_epoch(info: Dict) -> Optional[float]:
+    exp = info.get("expires_epoch")
+    if exp is not None:
+        return exp
+    try:  # tokens issued before expires_epoch existed
+        return datetime.fromisoformat(info["expires_at"]).timestamp()
+    except Exception:
+        return None
 
 
 def _is_expired(info: Dict) -> bool:
-    try:
-        exp = datetime.fromisoformat(info["expires_at"])  # retains tz
-    except Exception:
-        return True
-    return exp <= _now()
+    exp = _expires_epoch(info)
+    return exp is None or exp <= time.time()
 
 
 def _clean_expired(tokens: Dict[str, Dict]) -> Dict[str, Dict]:
@@ -169,12 +276,10 @@ def seconds_left(token: str) -> Optional[int]:
     info = tokens.get(token)
     if not info:
         return None
-    try:
-        exp = datetime.fromisoformat(info["expires_at"]).timestamp()
-        left = int(exp - _now().timestamp())
-        return max(left, 0)
-    except Exception:
+    exp = _expires_epoch(info)
+    if exp is None:
         return None
+    return max(int(exp - time.time()), 0)
 
 
 @_with_lock
@@ -194,26 +299,37 @@ def issue_token(agent: str, scopes: Optional[List[str]] = None, ttl_minutes: int
         "scopes": scopes,
         "issued_at": _iso(issued),
         "expires_at": _iso(expires),
+        "issued_epoch": issued.timestamp(),
+        "expires_epoch": expires.timestamp(),
         "revoked": False,
     }
-    tokens = _load_tokens()
-    tokens[token] = info
-    tokens = _clean_expired(tokens)
-    _save_tokens(tokens)
+    with _tokens_lock:
+        tokens = _clean_expired(_load_tokens(fresh=True))
+        tokens[token] = info
+        _save_tokens(tokens)
     _audit("issue_token", agent=agent, scopes=",".join(scopes), token=token, ttl_min=int(ttl_minutes))
     return token, info
 
 
 @_with_lock
 def revoke_token(token: str) -> bool:
-    tokens = _load_tokens()
-    if token in tokens:
-        info = tokens[token]
-        info["revoked"] = True
+    with _tokens_lock:
+        tokens = dict(_load_tokens(fresh=True))
+        info = tokens.get(token)
+        if info is None:
+            return False
+        tokens[token] = {**info, "revoked": True}
         _save_tokens(tokens)
-        _audit("revoke_token", agent=info.get("agent"), token=token)
-        return True
-    return False
+    _audit("revoke_token", agent=info.get("agent"), token=token)
+    return True
+
+
+@_with_lock
+def _drop_token(token: str) -> None:
+    with _tokens_lock:
+        tokens = dict(_load_tokens(fresh=True))
+        if tokens.pop(token, None) is not None:
+            _save_tokens(tokens)
 
 
 def list_active_tokens(agent: Optional[str] = None) -> Dict[str, Dict]:
@@ -227,6 +343,8 @@ def list_active_tokens(agent: Optional[str] = None) -> Dict[str, Dict]:
 def check_token(token: str, needed_scope: str, expected_agent: Optional[str] = None) -> bool:
     tokens = _load_tokens()
     info = tokens.get(token)
+    # computed once from `info` and reused for the audit line below
+    secs = max(int((_expires_epoch(info) or 0.0) - time.time()), 0) if info else 0
     ok = False
     reason = "ok"
     if not info:
@@ -236,8 +354,7 @@ def check_token(token: str, needed_scope: str, expected_agent: Optional[str] = N
     elif _is_expired(info):
         # tidy: remove expired on the fly
         try:
-            del tokens[token]
-            _save_tokens(tokens)
+            _drop_token(token)
         except Exception:
             pass
         reason = "expired"
@@ -255,14 +372,24 @@ def check_token(token: str, needed_scope: str, expected_agent: Optional[str] = N
         need=needed_scope,
         expected=expected_agent,
         result="allow" if ok else f"deny:{reason}",
-        secs_left=seconds_left(token) or 0,
+        secs_left=secs,
     )
     return ok
 
 
 # ---------- Init ----------
 
+_DEFAULTS_DONE = False
+
+
 def ensure_defaults() -> None:
+    """First-run setup; a no-op once both state files exist (or already ran here)."""
+    global _DEFAULTS_DONE
+    if _DEFAULTS_DONE:
+        return
+    _DEFAULTS_DONE = True
+    if REGISTRY_PATH.exists() and TOKENS_PATH.exists():
+        return
     _load_registry()
     _save_tokens(_clean_expired(_load_tokens()))
 
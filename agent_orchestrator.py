@@ -10,7 +10,8 @@ Usage:
   python3 agent_orchestrator.py --approve "Push new app build to prod after tests pass."
   python3 agent_orchestrator.py --launch-app   # optional: start Streamlit
 """
-import os, shlex, subprocess, json, time, argparse, sys
+import os, shlex, subprocess, json, time, argparse, sys, threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timezone
 
@@ -25,6 +26,23 @@ else:
     from agent_fs_guard import list_agents, register_agent, issue_token, list_active_tokens, revoke_token, check_token, DEFAULT_SCOPES
     def seconds_left(_): return None
 
+# ---------- HTTP ----------
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+def _http():
+    """Shared keep-alive session so repeat calls to the same host skip the TLS handshake."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                s = requests.Session()
+                s.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+                _SESSION = s
+    return _SESSION
+
 # ---------- TTS (Claude + friends) ----------
 def tts_say(text: str, voice="Samantha", rate_wpm=185):
     """Prefer ElevenLabs if configured; else macOS 'say'; else print."""
@@ -33,8 +51,7 @@ def tts_say(text: str, voice="Samantha", rate_wpm=185):
     el_voice = os.getenv("ELEVENLABS_VOICE_ID")
     try:
         if el_key and el_voice:
-            import requests
-            r = requests.post(
+            r = _http().post(
                 f"https://api.elevenlabs.io/v1/text-to-speech/{el_voice}",
                 headers={"xi-api-key": el_key, "accept":"audio/mpeg","content-type":"application/json"},
                 json={"text": text, "model_id":"eleven_monolingual_v1","voice_settings":{"stability":0.55,"similarity_boost":0.55}}
@@ -71,7 +88,7 @@ def ensure_agents_and_tokens(ttl_minutes=120, scopes=("read","write","list")):
         active = list_active_tokens(agent=a)
         # keep the newest active if present
         if active:
-            tok = sorted(active.items(), key=lambda kv: kv[1].get("expires_at",""))[-1][0]
+            tok = max(active.items(), key=lambda kv: kv[1].get("expires_at",""))[0]
             issued[a] = tok
         else:
             tok, _info = issue_token(agent=a, scopes=list(scopes), ttl_minutes=ttl_minutes)
@@ -82,14 +99,13 @@ def ensure_agents_and_tokens(ttl_minutes=120, scopes=("read","write","list")):
 def openai_chat(prompt: str) -> str | None:
     key = os.getenv("OPENAI_API_KEY")
     if not key: return None
-    import requests
     body = {"model":"gpt-4o-mini","messages":[
         {"role":"system","content":"You are Jenny, a pragmatic reviewer. Approve only if the plan is safe, reversible, and logged. Answer strictly with APPROVE or HOLD and one short reason."},
         {"role":"user","content":prompt}
     ],"max_tokens":120}
     try:
-        r = requests.post("https://api.openai.com/v1/chat/completions",
-                          headers={"Authorization":f"Bearer {key}"}, json=body, timeout=25)
+        r = _http().post("https://api.openai.com/v1/chat/completions",
+                         headers={"Authorization":f"Bearer {key}"}, json=body, timeout=25)
         if r.status_code==200:
             return r.json()["choices"][0]["message"]["content"].strip()
     except Exception:
@@ -99,14 +115,13 @@ def openai_chat(prompt: str) -> str | None:
 def anthropic_chat(prompt: str) -> str | None:
     key = os.getenv("ANTHROPIC_API_KEY")
     if not key: return None
-    import requests
     body = {"model":"claude-3-5-sonnet-20240620","max_tokens":200,
             "system":"You are Luna, a cautious second reviewer. Reply only: APPROVE or HOLD, plus one-line reason.",
             "messages":[{"role":"user","content":prompt}]}
     try:
-        r = requests.post("https://api.anthropic.com/v1/messages",
-                          headers={"x-api-key":key,"anthropic-version":"2023-06-01","content-type":"application/json"},
-                          json=body, timeout=25)
+        r = _http().post("https://api.anthropic.com/v1/messages",
+                         headers={"x-api-key":key,"anthropic-version":"2023-06-01","content-type":"application/json"},
+                         json=body, timeout=25)
         if r.status_code==200:
             return r.json()["content"][0]["text"].strip()
     except Exception:
@@ -120,8 +135,11 @@ def normalize_vote(text: str | None) -> str:
 
 def approval_gate(task_summary: str) -> dict:
     """Ask Jenny(OpenAI) and Luna(Anthropic). Majority rules. Returns dict with votes."""
-    j = openai_chat(task_summary)
-    l = anthropic_chat(task_summary)
+    # both reviewers run concurrently: latency is max(a, b) instead of a + b
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        j_future = ex.submit(openai_chat, task_summary)
+        l_future = ex.submit(anthropic_chat, task_summary)
+        j, l = j_future.result(), l_future.result()
     j_vote = normalize_vote(j)
     l_vote = normalize_vote(l)
     votes = [j_vote, l_vote]
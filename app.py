@@ -6,11 +6,22 @@
 # - Provider-specific model dropdowns with pricing
 # - Clean, bold styling
 
-import os, re, json, time, shlex, subprocess, typing, requests, threading, fcntl
+import os, re, json, time, shlex, subprocess, typing, requests, threading, fcntl, functools, hashlib
+from collections import deque
+from dataclasses import dataclass, asdict
+from enum import IntEnum
+from itertools import islice
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
+from types import MappingProxyType
 import streamlit as st
 
+# Optional: pyahocorasick speeds up wake-word scanning of long transcripts
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # Handle streamlit-autorefresh import gracefully
 try:
     from streamlit_autorefresh import st_autorefresh
@@ -164,6 +175,33 @@ RESERVED_AGENTS = {
     }
 }
 
+# The seven agents every activation / sync / status sweep iterates over
+CORE_AGENTS = ("Jenny", "Luna", "Demo", "Cannon", "Bob the Builder", "Lexi", "Ava")
+
+# Read-only permission views, built once per agent instead of per lookup
+_NO_PERMISSIONS = MappingProxyType({"permissions_level": "none", "requirements": (), "tools": ()})
+_AGENT_PERMISSIONS = {}
+# Display strings used by the routing replies, joined once per registration
+_NO_DISPLAY = MappingProxyType({"caps3": "", "caps2": "", "tools": ""})
+_AGENT_DISPLAY = {}
+
+def _index_agent_permissions(agent_name: str):
+    record = AGENT_REGISTRY[agent_name]
+    _AGENT_PERMISSIONS[agent_name] = MappingProxyType({
+        "permissions_level": record.get("permissions_level", "none"),
+        "requirements": tuple(record.get("activation_requirements", ())),
+        "tools": tuple(record.get("approved_tools", ()))
+    })
+    capabilities = record.get("core_capabilities", [])
+    _AGENT_DISPLAY[agent_name] = MappingProxyType({
+        "caps3": ", ".join(capabilities[:3]),
+        "caps2": ", ".join(capabilities[:2]),
+        "tools": ", ".join(record.get("approved_tools", []))
+    })
+
+for _name in AGENT_REGISTRY:
+    _index_agent_permissions(_name)
+
 def register_agents(agents_list):
     """Register new agents in the system"""
     for agent in agents_list:
@@ -173,6 +211,10 @@ def register_agents(agents_list):
             "profile_image": agent.get("profile_image", "🤖"),
             "activation_requirements": ["user_approval"]
         }
+        _index_agent_permissions(agent["name"])
+    global _ROUTE_TABLE
+    _ROUTE_TABLE = _build_route_table()
+    _templated_response.cache_clear()
     return f"Registered {len(agents_list)} agents successfully"
 
 def register_reserved(future_agents_list):
@@ -184,35 +226,149 @@ def register_reserved(future_agents_list):
         }
     return f"Reserved {len(future_agents_list)} agent slots"
 
-def get_agent_permissions(agent_name: str) -> dict:
-    """Get permission level and requirements for an agent"""
-    if agent_name in AGENT_REGISTRY:
-        return {
-            "permissions_level": AGENT_REGISTRY[agent_name]["permissions_level"],
-            "requirements": AGENT_REGISTRY[agent_name]["activation_requirements"],
-            "tools": AGENT_REGISTRY[agent_name]["approved_tools"]
-        }
-    return {"permissions_level": "none", "requirements": [], "tools": []}
+def get_agent_permissions(agent_name: str) -> MappingProxyType:
+    """Get permission level and requirements for an agent (read-only view)"""
+    return _AGENT_PERMISSIONS.get(agent_name, _NO_PERMISSIONS)
 
 # =========================
 # MEMORY LOGGING SYSTEM
 # =========================
+MEMORY_ENTRY_LIMIT = 100   # entries kept per agent (oldest evicted)
+ACCESS_LOG_LIMIT = 500     # access_log records kept per agent
+ENTRY_CONTENT_LIMIT = 1500 # chars stored per memory entry
+
+_MEMORY_KEYS = {}
+
+def _memory_key(agent_name: str) -> str:
+    """session_state key for an agent's memory space (lowercased once per name)"""
+    key = _MEMORY_KEYS.get(agent_name)
+    if key is None:
+        key = _MEMORY_KEYS[agent_name] = f"{agent_name.lower()}_memory"
+    return key
+
+# (agent, memory key) for every core agent
+_CORE_AGENT_KEYS = tuple((agent, _memory_key(agent)) for agent in CORE_AGENTS)
+
+def _tail(seq, n: int) -> list:
+    """Last n items of a list or deque (deques don't support slicing)"""
+    size = len(seq)
+    return list(islice(seq, max(0, size - n), size))
+
+# agent_id / source / action_type come from a tiny vocabulary; keep one copy of each string
+_SHARED_STRINGS = {}
+
+def _shared(text: str) -> str:
+    return _SHARED_STRINGS.setdefault(text, text)
+
+def _clip(text: str, n: int) -> str:
+    """text[:n] without the copy when text is already short enough"""
+    return text if len(text) <= n else text[:n]
+
+class Action(IntEnum):
+    """access_log action codes"""
+    LOGGING_ENABLED = 1
+    WRITE = 2
+    READ = 3
+    ROUTING_ENABLED = 4
+    CROSS_ACCESS_GRANTED = 5
+    CROSS_READ = 6
+    COLLAB_READ = 7
+    TASK_ROUTED = 8
+    VOICE_RECEIVED = 9
+    ENHANCED_VOICE_RECEIVED = 10
+    ACTIVATED = 11
+    CAPS_ASSIGNED = 12
+    DOMAINS_SET = 13
+
+def _append_access(space: dict, action: Action, meta: tuple = (), timestamp: str = None):
+    """Record an access as a (timestamp, action, meta) tuple"""
+    space["access_log"].append((timestamp or datetime.now().isoformat(), action, meta))
+
+# Display templates for actions whose meta carries raw text; slicing happens here, not at log time
+_ACCESS_FORMATS = {
+    Action.TASK_ROUTED: "{0}: '{1:.50}...' assigned to {2}",
+    Action.VOICE_RECEIVED: "{0}: '{1:.50}...' from user",
+}
+
+def describe_access(record: tuple) -> str:
+    """Human-readable line for an access_log tuple (rendered only when displayed)"""
+    timestamp, action, meta = record
+    fmt = _ACCESS_FORMATS.get(action)
+    detail = fmt.format(*meta) if fmt else ", ".join(map(str, meta))
+    return f"{timestamp[:19]} {action.name.lower()}" + (f" ({detail})" if detail else "")
+
+@dataclass(slots=True)
+class LogEntry:
+    """One memory entry; slotted to keep 100-entry buffers per agent small.
+
+    Entries are never modified after they are appended (eviction only drops
+    them), so holding a reference to one is safe.
+
+    Readers written against the old dict entries keep working through
+    entry["content"] / entry.get("timestamp").
+    """
+    id: int
+    timestamp: str
+    content: str
+    source: str
+    action_type: str
+    agent_id: str
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+@dataclass(slots=True)
+class TaskLogEntry(LogEntry):
+    """Memory entry for a routed task"""
+    task_id: str
+    task_type: str
+
+@dataclass(slots=True)
+class VoiceLogEntry(LogEntry):
+    """Memory entry for a routed voice command"""
+    command_id: str
+    intent: str
+
+def _next_entry_id(memory_space: dict) -> int:
+    entry_id = memory_space["next_entry_id"]
+    memory_space["next_entry_id"] = entry_id + 1
+    return entry_id
+
 def create_agent_memory_space(agent_name: str):
     """Create dedicated memory space for an agent"""
-    memory_key = f"{agent_name.lower()}_memory"
+    activate_if_pending(agent_name)
+    memory_key = _memory_key(agent_name)
     if memory_key not in st.session_state:
         st.session_state[memory_key] = {
             "agent_id": agent_name,
             "created_at": datetime.now().isoformat(),
-            "entries": [],
-            "access_log": [],
+            "entries": deque(maxlen=MEMORY_ENTRY_LIMIT),
+            "access_log": deque(maxlen=ACCESS_LOG_LIMIT),
+            "next_entry_id": 0,
             "linked_agents": AGENT_REGISTRY.get(agent_name, {}).get("linked_agents", []),
+            "primary_domains": [],
             "logging_enabled": False,
             "routing_enabled": False,
             "status": "idle"
         }
     return memory_key
 
+def _ensure_memory_space(agent_name: str) -> dict:
+    """The agent's memory space dict, created on first use (one lookup when it exists)"""
+    memory_space = _agent_memory(agent_name)
+    if memory_space is None:
+        memory_space = st.session_state[create_agent_memory_space(agent_name)]
+    return memory_space
+
 def enable_memory_logging(agent_name: str):
     """Enable memory logging for a specific agent"""
     memory_key = create_agent_memory_space(agent_name)
@@ -220,158 +376,157 @@ def enable_memory_logging(agent_name: str):
     memory_space["logging_enabled"] = True
     memory_space["status"] = "logging_active"
     
-    # Log the activation
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "action": "memory_logging_enabled",
-        "details": f"Memory logging activated for {agent_name}",
-        "source": "system"
-    }
-    memory_space["access_log"].append(log_entry)
+    _append_access(memory_space, Action.LOGGING_ENABLED)
     
     return f"Memory logging enabled for {agent_name}"
 
 def log_to_agent_memory(agent_name: str, content: str, source: str = "user", action_type: str = "message"):
     """Log content to agent's dedicated memory space"""
-    memory_key = f"{agent_name.lower()}_memory"
-    if memory_key in st.session_state and st.session_state[memory_key]["logging_enabled"]:
-        entry = {
-            "id": len(st.session_state[memory_key]["entries"]),
-            "timestamp": datetime.now().isoformat(),
-            "content": content[:1500],  # Limit entry size
-            "source": source,
-            "action_type": action_type,
-            "agent_id": agent_name
-        }
-        
-        st.session_state[memory_key]["entries"].append(entry)
+    memory_space = _agent_memory(agent_name)
+    if memory_space is not None and memory_space["logging_enabled"]:
+        entry_id = _next_entry_id(memory_space)
+        timestamp = datetime.now().isoformat()
+        content = _clip(content, ENTRY_CONTENT_LIMIT)
+        source, action_type, agent_name = _shared(source), _shared(action_type), _shared(agent_name)
+        entry = LogEntry(
+            id=entry_id,
+            timestamp=timestamp,
+            content=content,
+            source=source,
+            action_type=action_type,
+            agent_id=agent_name
+        )
         
-        # Also log access
-        access_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "action": "memory_write",
-            "details": f"Added {action_type} from {source}",
-            "entry_id": entry["id"]
-        }
-        st.session_state[memory_key]["access_log"].append(access_entry)
+        memory_space["entries"].append(entry)
         
-        # Keep memory manageable (last 100 entries)
-        if len(st.session_state[memory_key]["entries"]) > 100:
-            st.session_state[memory_key]["entries"] = st.session_state[memory_key]["entries"][-100:]
+        _append_access(memory_space, Action.WRITE, (entry.id,), entry.timestamp)
         
         return True
     return False
 
-def get_agent_memory(agent_name: str, limit: int = 10) -> list:
-    """Retrieve recent entries from agent's memory"""
-    memory_key = f"{agent_name.lower()}_memory"
-    if memory_key in st.session_state:
-        memory_space = st.session_state[memory_key]
-        
-        # Log access
-        access_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "action": "memory_read",
-            "details": f"Retrieved {limit} entries",
-            "source": "system"
-        }
-        memory_space["access_log"].append(access_entry)
-        
-        return memory_space["entries"][-limit:] if memory_space["entries"] else []
-    return []
+def get_agent_memory(agent_name: str, limit: int = 10, track: bool = False) -> list:
+    """Retrieve recent entries from agent's memory (logs a READ access only when track=True)"""
+    memory_space = _agent_memory(agent_name)
+    if memory_space is None:
+        return []
+    if track:
+        _append_access(memory_space, Action.READ, (limit,))
+    return _tail(memory_space["entries"], limit)
 
 # =========================
 # CHAT ROUTING SYSTEM
 # =========================
 def setup_chat_routing(agent_name: str):
     """Setup chat routing for an agent"""
-    memory_key = f"{agent_name.lower()}_memory"
-    if memory_key in st.session_state:
-        st.session_state[memory_key]["routing_enabled"] = True
-        st.session_state[memory_key]["status"] = "routing_active"
-        
-        # Log the routing setup
-        log_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "action": "chat_routing_enabled",
-            "details": f"Chat routing activated for {agent_name}",
-            "source": "system"
-        }
-        st.session_state[memory_key]["access_log"].append(log_entry)
-        
-        return f"Chat routing enabled for {agent_name}"
-    return f"Failed to setup chat routing for {agent_name}"
+    memory_space = _agent_memory(agent_name)
+    if memory_space is None:
+        return f"Failed to setup chat routing for {agent_name}"
+    memory_space["routing_enabled"] = True
+    memory_space["status"] = "routing_active"
+    
+    _append_access(memory_space, Action.ROUTING_ENABLED)
+    
+    return f"Chat routing enabled for {agent_name}"
+
+_SECURITY_KEYWORDS = ('vulnerability', 'security', 'attack', 'threat')
+_EXECUTION_KEYWORDS = ('run', 'execute', 'script', 'command', 'deploy')
+_BUILD_KEYWORDS = ('build', 'create', 'deploy', 'optimize', 'system')
+
+# Keyword categories as bits so one scan of a message serves every agent
+KW_SECURITY, KW_EXECUTION, KW_BUILD = 1, 2, 4
+
+_KEYWORD_BITS = {}
+for _bit, _words in ((KW_SECURITY, _SECURITY_KEYWORDS), (KW_EXECUTION, _EXECUTION_KEYWORDS), (KW_BUILD, _BUILD_KEYWORDS)):
+    for _word in _words:
+        _KEYWORD_BITS[_word] = _KEYWORD_BITS.get(_word, 0) | _bit
+_WORD_RE = re.compile(r"[a-z]+")
+
+def _keyword_mask(msg_lower: str) -> int:
+    """Bitmask of keyword categories present in an already-lowercased message.
+
+    Matches whole words only, so "threatened" no longer counts as "threat".
+    """
+    mask = 0
+    for word in _KEYWORD_BITS.keys() & set(_WORD_RE.findall(msg_lower)):
+        mask |= _KEYWORD_BITS[word]
+    return mask
+
+# agent -> (category bit, header, on-keyword body, otherwise body); filled from AGENT_REGISTRY below
+_ROUTE_TEMPLATES = {
+    "Demo": (
+        KW_SECURITY,
+        "🛡️ **Demo (Cybersecurity Analysis)**\\n\\n"
+        "Analyzing message for security implications...\\n\\n"
+        "**Assessment:** Based on my {perm} clearance and capabilities in {caps3}, ",
+        "I detect security-related content. Initiating detailed analysis.\\n\\n"
+        "**Tools Available:** {tools}\\n"
+        "**Recommendation:** Proceed with enhanced monitoring and verification protocols.",
+        "no immediate security concerns detected. Message appears safe for processing.\\n\\n"
+        "**Status:** Clear for normal operations."
+    ),
+    "Cannon": (
+        KW_EXECUTION,
+        "⚡ **Cannon (Execution Ready)**\\n\\n"
+        "Message received and queued for execution analysis...\\n\\n"
+        "**Permission Level:** {perm} - Authorized for system-level operations\\n",
+        "**Execution Request Detected:**\\n"
+        "- Available tools: {tools}\\n"
+        "- Capabilities: {caps3}\\n"
+        "- Status: **Ready to execute** (pending user confirmation)",
+        "**Analysis:** Non-execution request. Standing by for commands requiring {caps2}."
+    ),
+    "Bob the Builder": (
+        KW_BUILD,
+        "🔧 **Bob the Builder (Engineering Mode)**\\n\\n"
+        "Analyzing request for system building and optimization opportunities...\\n\\n"
+        "**Engineering Assessment:**\\n",
+        "- **Project Type:** System building/optimization detected\\n"
+        "- **Available Tools:** {tools}\\n"
+        "- **Capabilities:** {caps3}\\n"
+        "- **Status:** Ready to architect solution with {perm} privileges",
+        "- **General Inquiry:** Standing by to assist with {caps2}\\n"
+        "- **Recommendation:** Let me know if you need any system building or optimization."
+    ),
+}
+
+def _build_route_table() -> dict:
+    """Render the route templates once: agent -> (category bit, hit response, miss response)"""
+    table = {}
+    for agent_name, (category, header, hit, miss) in _ROUTE_TEMPLATES.items():
+        config = AGENT_REGISTRY.get(agent_name, {})
+        fields = {"perm": config.get("permissions_level", "standard"), **_AGENT_DISPLAY.get(agent_name, _NO_DISPLAY)}
+        header = header.format(**fields)
+        table[agent_name] = (category, header + hit.format(**fields), header + miss.format(**fields))
+    return table
+
+_ROUTE_TABLE = _build_route_table()
+
+@functools.lru_cache(maxsize=512)
+def _templated_response(agent_name: str, keyword_hit: bool) -> str:
+    """Deterministic reply body for route_message_to_agent (no LLM involved)"""
+    route = _ROUTE_TABLE.get(agent_name)
+    if route is not None:
+        return route[1] if keyword_hit else route[2]
+    caps3 = _AGENT_DISPLAY.get(agent_name, _NO_DISPLAY)["caps3"]
+    return f"🤖 **{agent_name}**: Processing your message with available capabilities: {caps3}"
 
 def route_message_to_agent(agent_name: str, message: str, context: dict = None) -> str:
     """Route a message to a specific agent and get response"""
-    memory_key = f"{agent_name.lower()}_memory"
+    msg_lower = message.lower()
     
     # Log incoming message to agent memory
     log_to_agent_memory(agent_name, message, "user", "routed_message")
     
-    # Get agent configuration
-    agent_config = AGENT_REGISTRY.get(agent_name, {})
-    capabilities = agent_config.get("core_capabilities", [])
-    tools = agent_config.get("approved_tools", [])
-    permission_level = agent_config.get("permissions_level", "standard")
-    
     # Get agent's memory for context
     agent_memory = get_agent_memory(agent_name, limit=5)
-    memory_context = ""
-    if agent_memory:
-        memory_context = f"\\n[Memory Context: {len(agent_memory)} recent entries]\\n"
-        for entry in agent_memory[-3:]:  # Last 3 entries
-            memory_context += f"- {entry['timestamp'][:19]}: {entry['content'][:100]}...\\n"
     
     # Generate agent-specific response based on role and capabilities
-    if agent_name == "Demo":
-        response = f"🛡️ **Demo (Cybersecurity Analysis)**\\n\\n"
-        response += f"Analyzing message for security implications...\\n\\n"
-        response += f"**Assessment:** Based on my {permission_level} clearance and capabilities in {', '.join(capabilities[:3])}, "
-        
-        # Security-focused analysis
-        if any(word in message.lower() for word in ['vulnerability', 'security', 'attack', 'threat']):
-            response += "I detect security-related content. Initiating detailed analysis.\\n\\n"
-            response += f"**Tools Available:** {', '.join(tools)}\\n"
-            response += f"**Recommendation:** Proceed with enhanced monitoring and verification protocols."
-        else:
-            response += "no immediate security concerns detected. Message appears safe for processing.\\n\\n"
-            response += f"**Status:** Clear for normal operations."
-            
-    elif agent_name == "Cannon":
-        response = f"⚡ **Cannon (Execution Ready)**\\n\\n"
-        response += f"Message received and queued for execution analysis...\\n\\n"
-        response += f"**Permission Level:** {permission_level} - Authorized for system-level operations\\n"
-        
-        # Execution-focused analysis
-        if any(word in message.lower() for word in ['run', 'execute', 'script', 'command', 'deploy']):
-            response += "**Execution Request Detected:**\\n"
-            response += f"- Available tools: {', '.join(tools)}\\n"
-            response += f"- Capabilities: {', '.join(capabilities[:3])}\\n"
-            response += "- Status: **Ready to execute** (pending user confirmation)"
-        else:
-            response += f"**Analysis:** Non-execution request. Standing by for commands requiring {', '.join(capabilities[:2])}."
-            
-    elif agent_name == "Bob the Builder":
-        response = f"🔧 **Bob the Builder (Engineering Mode)**\\n\\n"
-        response += f"Analyzing request for system building and optimization opportunities...\\n\\n"
-        response += f"**Engineering Assessment:**\\n"
-        
-        # Building-focused analysis
-        if any(word in message.lower() for word in ['build', 'create', 'deploy', 'optimize', 'system']):
-            response += f"- **Project Type:** System building/optimization detected\\n"
-            response += f"- **Available Tools:** {', '.join(tools)}\\n"
-            response += f"- **Capabilities:** {', '.join(capabilities[:3])}\\n"
-            response += f"- **Status:** Ready to architect solution with {permission_level} privileges"
-        else:
-            response += f"- **General Inquiry:** Standing by to assist with {', '.join(capabilities[:2])}\\n"
-            response += f"- **Recommendation:** Let me know if you need any system building or optimization."
-    
-    else:
-        response = f"🤖 **{agent_name}**: Processing your message with available capabilities: {', '.join(capabilities[:3])}"
+    route = _ROUTE_TABLE.get(agent_name)
+    keyword_hit = route is not None and bool(_keyword_mask(msg_lower) & route[0])
+    response = _templated_response(agent_name, keyword_hit)
     
     # Add memory context if available
-    if memory_context:
+    if agent_memory:
         response += f"\\n\\n**Memory Context Used:** {len(agent_memory)} recent interactions considered"
     
     # Log the response to agent memory
@@ -381,15 +536,17 @@ def route_message_to_agent(agent_name: str, message: str, context: dict = None)
 
 def display_status(agent_name: str, status: str = "✅ Running", outline: str = "green"):
     """Update agent status display"""
-    if agent_name in st.session_state["agent_status"]:
-        st.session_state["agent_status"][agent_name]["status"] = "running" if "Running" in status else "ready"
-        st.session_state["agent_status"][agent_name]["last_action"] = status
-        st.session_state["agent_status"][agent_name]["available"] = True
+    # agent_status is never seeded in session_state, so don't assume it exists
+    agent_status = st.session_state.get("agent_status", {}).get(agent_name)
+    if agent_status is not None:
+        agent_status["status"] = "running" if "Running" in status else "ready"
+        agent_status["last_action"] = status
+        agent_status["available"] = True
         
     # Also update memory space status
-    memory_key = f"{agent_name.lower()}_memory"
-    if memory_key in st.session_state:
-        st.session_state[memory_key]["status"] = f"running_{outline}"
+    memory_space = _agent_memory(agent_name)
+    if memory_space is not None:
+        memory_space["status"] = f"running_{outline}"
         
 def set_agent_memory_structure(memory_mapping: dict):
     """Set up the agent memory structure"""
@@ -408,40 +565,89 @@ def link_chat_to_memory(agent_selection_ui: bool = True):
     
     return "Chat linked to memory system with agent selection UI"
 
+# =========================
+# LAZY AGENT ACTIVATION
+# =========================
+def queue_agent_activation(agent_name: str, **settings):
+    """Record that an agent should be activated; its memory space is built on first use.
+
+    Recognized settings: capabilities, accessible_agents, memory_space_name.
+    """
+    pending = st.session_state.setdefault("pending_agent_activations", {})
+    pending.setdefault(agent_name, {}).update(settings)
+    return f"{agent_name} queued for memory logging and chat routing (activates on first use)"
+
+def activate_if_pending(agent_name: str):
+    """Build a queued agent's memory space and apply its activation settings"""
+    pending = st.session_state.get("pending_agent_activations")
+    if not pending or agent_name not in pending:
+        return
+    _activate_agent(agent_name, **pending.pop(agent_name))
+
+def _agent_memory(agent_name: str, memory_key: str = None):
+    """The agent's memory space (None if it has none), activating a queued agent first"""
+    activate_if_pending(agent_name)
+    return st.session_state.get(memory_key or _memory_key(agent_name))
+
+def _activate_agent(agent_name: str, capabilities: list = None, accessible_agents: list = None,
+                    memory_space_name: str = None):
+    """Logging + routing + running status + settings in one pass, with one access_log record"""
+    memory_space = st.session_state[create_agent_memory_space(agent_name)]
+    memory_space["logging_enabled"] = True
+    memory_space["routing_enabled"] = True
+    memory_space["status"] = "running_green"
+    
+    agent_status = st.session_state.get("agent_status", {}).get(agent_name)
+    if agent_status is not None:
+        agent_status["status"] = "running"
+        agent_status["last_action"] = "✅ Running"
+        agent_status["available"] = True
+    
+    if memory_space_name is not None:
+        memory_space["memory_space_name"] = memory_space_name
+        memory_space["structure_initialized"] = True
+    if capabilities is not None:
+        memory_space["capabilities"] = capabilities
+        memory_space["capabilities_enabled"] = True
+    if accessible_agents is not None:
+        memory_space["accessible_agents"] = accessible_agents
+        memory_space["cross_agent_access"] = True
+    
+    _append_access(memory_space, Action.ACTIVATED, tuple(accessible_agents or ()))
+
+def _queue_activations(plan, label: str, report_links: bool = False) -> list:
+    """Queue (agent, settings) pairs; the result lines are kept per label.
+
+    Runs once per session for each label: Streamlit reruns call the activation
+    functions again and get the recorded results back.
+    """
+    activation_results = st.session_state.setdefault("_activation_results", {})
+    if label in activation_results:
+        return list(activation_results[label])
+    
+    results = []
+    for agent, settings in plan:
+        results.append(queue_agent_activation(agent, **settings))
+        if report_links:
+            results.append(f"🔗 {agent} linked to: {', '.join(settings['accessible_agents'])}")
+    
+    activation_results[label] = tuple(results)
+    return results
+
 # =========================
 # MAIN ACTIVATION FUNCTION
 # =========================
 def activate_agent_memory_and_routing():
     """Main function to activate memory logging and chat routing for registered agents"""
-    agents = ["Demo", "Cannon", "Bob the Builder"]
-    results = []
-    
-    for agent in agents:
-        # Enable memory logging
-        memory_result = enable_memory_logging(agent)
-        results.append(memory_result)
-        
-        # Setup chat routing
-        routing_result = setup_chat_routing(agent)
-        results.append(routing_result)
-        
-        # Display running status
-        display_status(agent, status="✅ Running", outline="green")
-        
-        # Log activation to main conversation
-        st.session_state.formatted_conversation += f"""
-        <div class='message system'>
-            <strong>🚀 Agent Activated:</strong> {agent} is now running with memory logging and chat routing enabled.
-        </div>
-        """
-    
-    # Set up memory structure
-    memory_structure_result = set_agent_memory_structure({
+    memory_spaces = {
         "Demo": "demo_memory",
         "Cannon": "cannon_memory", 
         "Bob the Builder": "bob_memory"
-    })
-    results.append(memory_structure_result)
+    }
+    results = _queue_activations(
+        ((agent, {"memory_space_name": name}) for agent, name in memory_spaces.items()),
+        "🚀 Agent Activated:"
+    )
     
     # Link chat to memory
     chat_link_result = link_chat_to_memory(agent_selection_ui=True)
@@ -452,72 +658,69 @@ def activate_agent_memory_and_routing():
 # =========================
 # CROSS-AGENT MEMORY ACCESS
 # =========================
+def _link_mesh(agents) -> dict:
+    """Full collaboration mesh: each agent -> list of every other agent"""
+    agents = tuple(agents)
+    return {agent: [a for a in agents if a != agent] for agent in agents}
+
 def link_agent_access(agent_name: str, accessible_agents: list):
     """Allow an agent to access memory from other agents"""
-    memory_key = f"{agent_name.lower()}_memory"
-    
     # Create memory space if it doesn't exist
-    if memory_key not in st.session_state:
-        create_agent_memory_space(agent_name)
+    memory_space = st.session_state[create_agent_memory_space(agent_name)]
+    
+    # Re-linking with an unchanged list is a no-op (no duplicate access_log entry)
+    if memory_space.get("accessible_agents") == accessible_agents:
+        return f"{agent_name} can now access memory from: {', '.join(accessible_agents)}"
     
     # Add access permissions
-    st.session_state[memory_key]["accessible_agents"] = accessible_agents
-    st.session_state[memory_key]["cross_agent_access"] = True
+    memory_space["accessible_agents"] = accessible_agents
+    memory_space["cross_agent_access"] = True
     
-    # Log the access linking
-    access_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "action": "cross_agent_access_enabled",
-        "details": f"Granted access to: {', '.join(accessible_agents)}",
-        "source": "system"
-    }
-    st.session_state[memory_key]["access_log"].append(access_entry)
+    _append_access(memory_space, Action.CROSS_ACCESS_GRANTED, tuple(accessible_agents))
     
     return f"{agent_name} can now access memory from: {', '.join(accessible_agents)}"
 
 def get_cross_agent_memory(requesting_agent: str, target_agent: str, limit: int = 5) -> list:
     """Get memory from another agent (if access is granted)"""
-    requesting_memory_key = f"{requesting_agent.lower()}_memory"
-    target_memory_key = f"{target_agent.lower()}_memory"
+    requesting_memory = _agent_memory(requesting_agent)
     
     # Check if requesting agent has access
-    if requesting_memory_key in st.session_state:
-        requesting_memory = st.session_state[requesting_memory_key]
-        accessible_agents = requesting_memory.get("accessible_agents", [])
-        
-        if target_agent in accessible_agents and target_memory_key in st.session_state:
-            # Log the cross-access
-            access_entry = {
-                "timestamp": datetime.now().isoformat(),
-                "action": "cross_agent_memory_read",
-                "details": f"Accessed {target_agent} memory ({limit} entries)",
-                "source": requesting_agent
-            }
-            requesting_memory["access_log"].append(access_entry)
-            
-            # Return the target agent's memory
-            return get_agent_memory(target_agent, limit)
+    if requesting_memory is None or target_agent not in requesting_memory.get("accessible_agents", ()):
+        return []
+    if _agent_memory(target_agent) is None:
+        return []
     
-    return []
+    _append_access(requesting_memory, Action.CROSS_READ, (target_agent, limit))
+    
+    # Return the target agent's memory
+    return get_agent_memory(target_agent, limit)
 
 def get_collaborative_context(agent_name: str) -> str:
     """Get collaborative context from linked agents"""
-    memory_key = f"{agent_name.lower()}_memory"
-    context = ""
+    agent_memory = _agent_memory(agent_name)
+    if agent_memory is None:
+        return ""
+    accessible_agents = agent_memory.get("accessible_agents", ())
+    if not accessible_agents:
+        return ""
+    
+    context = f"\\n[Collaborative Context from {len(accessible_agents)} linked agents]\\n"
+    agents_read = []
+    
+    # Read linked spaces directly; one access_log entry covers the whole sweep
+    for linked_agent in accessible_agents:
+        target_memory = _agent_memory(linked_agent)
+        if target_memory is None:
+            continue
+        agents_read.append(linked_agent)
+        recent_memory = _tail(target_memory["entries"], 2)
+        if recent_memory:
+            context += f"\\n**{linked_agent} Recent Activity:**\\n"
+            for entry in recent_memory:
+                context += f"- {entry['action_type']}: {_clip(entry['content'], 100)}...\\n"
     
-    if memory_key in st.session_state:
-        agent_memory = st.session_state[memory_key]
-        accessible_agents = agent_memory.get("accessible_agents", [])
-        
-        if accessible_agents:
-            context += f"\\n[Collaborative Context from {len(accessible_agents)} linked agents]\\n"
-            
-            for linked_agent in accessible_agents:
-                recent_memory = get_cross_agent_memory(agent_name, linked_agent, limit=2)
-                if recent_memory:
-                    context += f"\\n**{linked_agent} Recent Activity:**\\n"
-                    for entry in recent_memory:
-                        context += f"- {entry['action_type']}: {entry['content'][:100]}...\\n"
+    if agents_read:
+        _append_access(agent_memory, Action.COLLAB_READ, tuple(agents_read))
     
     return context
 
@@ -603,35 +806,11 @@ def route_primary_agent_message(agent_name: str, message: str, selected_models:
 def sync_jenny_luna_with_agents():
     """Sync Jenny and Luna with agent memory logging and routing"""
     agents = ["Jenny", "Luna"]
-    results = []
-    
-    for agent in agents:
-        # Enable memory logging
-        memory_result = enable_memory_logging(agent)
-        results.append(memory_result)
-        
-        # Setup chat routing
-        routing_result = setup_chat_routing(agent)
-        results.append(routing_result)
-        
-        # Display running status
-        display_status(agent, status="✅ Running", outline="green")
-        
-        # Log sync to main conversation
-        st.session_state.formatted_conversation += f"""
-        <div class='message system'>
-            <strong>🔗 Agent Synced:</strong> {agent} now has enhanced memory logging and cross-agent access.
-        </div>
-        """
-    
-    # Link Jenny and Luna to access logs from other agents
-    jenny_link_result = link_agent_access("Jenny", ["Demo", "Cannon", "Bob the Builder"])
-    luna_link_result = link_agent_access("Luna", ["Demo", "Cannon", "Bob the Builder"])
-    
-    results.append(jenny_link_result)
-    results.append(luna_link_result)
-    
-    return results
+    # Each gets access to logs from the other agents
+    return _queue_activations(
+        ((agent, {"accessible_agents": ["Demo", "Cannon", "Bob the Builder"]}) for agent in agents),
+        "🔗 Agent Synced:"
+    )
 
 def assign_capabilities(agent_name: str, capabilities: list):
     """Assign core capabilities to an agent"""
@@ -640,58 +819,25 @@ def assign_capabilities(agent_name: str, capabilities: list):
     memory_space["capabilities"] = capabilities
     memory_space["capabilities_enabled"] = True
     
-    # Log capability assignment
-    capability_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "action": "capabilities_assigned",
-        "capabilities": capabilities,
-        "agent": agent_name
-    }
-    
-    memory_space["logs"].append(capability_entry)
+    _append_access(memory_space, Action.CAPS_ASSIGNED, tuple(capabilities))
     return f"✅ Assigned {len(capabilities)} capabilities to {agent_name}"
 
 def unify_core_capabilities():
     """Unify core tools and memory syncing across all agents"""
-    agents = ["Jenny", "Luna", "Demo", "Cannon", "Bob the Builder", "Lexi", "Ava"]
+    agents = CORE_AGENTS
     
     core_capabilities = [
         "chat", "memory_logging", "voice_output", "speech_to_text",
         "document_reader", "web_scraping", "file_upload_handler", "multi_agent_collab"
     ]
     
-    results = []
-    
-    for agent in agents:
-        # Assign capabilities
-        capability_result = assign_capabilities(agent, core_capabilities)
-        results.append(capability_result)
-        
-        # Enable memory logging
-        memory_result = enable_memory_logging(agent)
-        results.append(memory_result)
-        
-        # Setup chat routing
-        routing_result = setup_chat_routing(agent)
-        results.append(routing_result)
-        
-        # Display running status
-        display_status(agent, status="✅ Running", outline="green")
-        
-        # Log unification to main conversation
-        st.session_state.formatted_conversation += f"""
-        <div class='message system'>
-            <strong>🔧 Agent Unified:</strong> {agent} now has all core capabilities and cross-agent access.
-        </div>
-        """
-    
-    # Link all agents together for collaboration
-    for agent in agents:
-        other_agents = [a for a in agents if a != agent]
-        link_result = link_agent_access(agent, other_agents)
-        results.append(f"🔗 {agent} linked to: {', '.join(other_agents)}")
-    
-    return results
+    # Capabilities and links to all other agents apply on first use
+    return _queue_activations(
+        ((agent, {"capabilities": core_capabilities, "accessible_agents": other_agents})
+         for agent, other_agents in _link_mesh(agents).items()),
+        "🔧 Agent Unified:",
+        report_links=True
+    )
 
 def assign_tiered_agent_capabilities():
     """Assign core + specialized capabilities to all agents"""
@@ -712,57 +858,52 @@ def assign_tiered_agent_capabilities():
         "Ava": ["policy_scanning", "terms_of_service_analysis", "contract_parsing", "compliance_monitoring"]
     }
 
-    agents = ["Jenny", "Luna", "Demo", "Cannon", "Bob the Builder", "Lexi", "Ava"]
-    results = []
+    agents = CORE_AGENTS
 
-    for agent in agents:
-        # Assign core capabilities
-        core_result = assign_capabilities(agent, tier1_core)
-        results.append(core_result)
-        
-        # Assign specialized capabilities
-        if agent in specialized:
-            special_result = assign_capabilities(agent, specialized[agent])
-            results.append(special_result)
-        
-        # Enable full agent functionality
-        memory_result = enable_memory_logging(agent)
-        results.append(memory_result)
-        
-        routing_result = setup_chat_routing(agent)
-        results.append(routing_result)
-        
-        display_status(agent, status="✅ Running", outline="green")
-        
-        # Link to all other agents
-        other_agents = [a for a in agents if a != agent]
-        link_result = link_agent_access(agent, other_agents)
-        results.append(f"🔗 {agent} linked to: {', '.join(other_agents)}")
-        
-        # Log tiered assignment
-        st.session_state.formatted_conversation += f"""
-        <div class='message system'>
-            <strong>🎯 Agent Enhanced:</strong> {agent} assigned core + specialized capabilities with full collaboration access.
-        </div>
-        """
-    
-    return results
+    # Core + specialized capabilities and links to all other agents
+    return _queue_activations(
+        ((agent, {"capabilities": tier1_core + specialized.get(agent, []), "accessible_agents": other_agents})
+         for agent, other_agents in _link_mesh(agents).items()),
+        "🎯 Agent Enhanced:",
+        report_links=True
+    )
 
 # =========================
 # MULTI-AGENT TASK ROUTING SYSTEM
 # =========================
-import re
+TASK_QUEUE_LIMIT = 10_000        # routed tasks kept per session (oldest evicted)
+VOICE_COMMANDS_LIMIT = 10_000    # voice commands kept per session
+
+# Command patterns, compiled once at import
+_DIRECT_CMD_RE = re.compile(r"^(\w+),\s*(.+)", re.IGNORECASE)
+_CROSS_AGENT_RE = re.compile(r"(\w+),?\s+(?:ask|tell|have)\s+(\w+)\s+to\s+(.+)", re.IGNORECASE)
+_TASK_CHAIN_RE = re.compile(r"(\w+)\s+(?:then|and then|after that)\s+(\w+)", re.IGNORECASE)
+
+# Lowercased name (and first word of multi-word names, e.g. "bob") -> registered agent name
+_AGENT_NAME_CANONICAL = {}
+for _agent in CORE_AGENTS:
+    _AGENT_NAME_CANONICAL[_agent.lower()] = _agent
+    _AGENT_NAME_CANONICAL.setdefault(_agent.split()[0].lower(), _agent)
+
+def _canonical_agent_name(token: str) -> str:
+    """Agent name for a command token; unknown names fall back to title case"""
+    return _AGENT_NAME_CANONICAL.get(token.lower()) or token.title()
+
+def _next_seq(counter_key: str, log_key: str) -> int:
+    """Monotonic per-session id counter (seeded from the log length for older sessions)"""
+    ss = st.session_state
+    n = ss.get(counter_key)
+    if n is None:
+        n = len(ss.get(log_key, ()))
+    ss[counter_key] = n + 1
+    return n
 
 def setup_task_router(agents):
     """Initialize task routing system for all agents"""
     st.session_state.setdefault("task_router_enabled", True)
     st.session_state.setdefault("active_agents", agents)
-    st.session_state.setdefault("task_queue", [])
-    st.session_state.setdefault("command_patterns", {
-        "direct_command": re.compile(r"^(\w+),\s*(.+)", re.IGNORECASE),
-        "cross_agent": re.compile(r"(\w+),?\s+(?:ask|tell|have)\s+(\w+)\s+to\s+(.+)", re.IGNORECASE),
-        "task_chain": re.compile(r"(\w+)\s+(?:then|and then|after that)\s+(\w+)", re.IGNORECASE)
-    })
+    st.session_state.setdefault("task_queue", deque(maxlen=TASK_QUEUE_LIMIT))
+    st.session_state.setdefault("task_counter", 0)
     return f"✅ Task router enabled for {len(agents)} agents"
 
 def enable_chat_command_parser():
@@ -772,16 +913,22 @@ def enable_chat_command_parser():
 
 def parse_task_command(message: str):
     """Parse natural language commands for task delegation"""
-    if not st.session_state.get("command_parser_enabled", False):
+    ss = st.session_state
+    if not ss.get("command_parser_enabled", False):
         return None
     
-    patterns = st.session_state.get("command_patterns", {})
-    active_agents = st.session_state.get("active_agents", [])
+    # Both command forms need a comma or an ask/tell/have verb; plain chat skips the regexes
+    if "," not in message:
+        lower = message.lower()
+        if "ask" not in lower and "tell" not in lower and "have" not in lower:
+            return None
+    
+    active_agents = ss.get("active_agents", [])
     
     # Direct command: "Agent, do something"
-    direct_match = patterns.get("direct_command", re.compile(r"")).match(message)
+    direct_match = _DIRECT_CMD_RE.match(message)
     if direct_match:
-        agent_name = direct_match.group(1).title()
+        agent_name = _canonical_agent_name(direct_match.group(1))
         task = direct_match.group(2)
         
         if agent_name in active_agents:
@@ -793,10 +940,10 @@ def parse_task_command(message: str):
             }
     
     # Cross-agent command: "Agent1, ask Agent2 to do something"
-    cross_match = patterns.get("cross_agent", re.compile(r"")).match(message)
+    cross_match = _CROSS_AGENT_RE.match(message)
     if cross_match:
-        requesting_agent = cross_match.group(1).title()
-        target_agent = cross_match.group(2).title()
+        requesting_agent = _canonical_agent_name(cross_match.group(1))
+        target_agent = _canonical_agent_name(cross_match.group(2))
         task = cross_match.group(3)
         
         if requesting_agent in active_agents and target_agent in active_agents:
@@ -815,7 +962,8 @@ def route_task_to_agent(task_command):
     if not task_command:
         return None
     
-    task_id = f"task_{len(st.session_state.get('task_queue', []))}"
+    task_queue = st.session_state.setdefault("task_queue", deque(maxlen=TASK_QUEUE_LIMIT))
+    task_id = f"task_{_next_seq('task_counter', 'task_queue')}"
     timestamp = datetime.now().isoformat()
     
     # Create task entry
@@ -835,7 +983,7 @@ def route_task_to_agent(task_command):
         task_entry["requesting_agent"] = task_command["requesting_agent"]
     
     # Add to task queue
-    st.session_state.setdefault("task_queue", []).append(task_entry)
+    task_queue.append(task_entry)
     
     # Log to agent memory
     log_task_to_agent_memory(task_command["target_agent"], task_entry)
@@ -844,30 +992,22 @@ def route_task_to_agent(task_command):
 
 def log_task_to_agent_memory(agent_name: str, task_entry: dict):
     """Log task assignment to agent's memory"""
-    memory_key = f"{agent_name.lower()}_memory"
-    if memory_key in st.session_state:
-        agent_memory = st.session_state[memory_key]
-        
+    agent_memory = _agent_memory(agent_name)
+    if agent_memory is not None:
         # Add task to memory entries
-        task_log = {
-            "timestamp": task_entry["timestamp"],
-            "action_type": "task_assigned",
-            "content": f"Task: {task_entry['task']}",
-            "source": task_entry["source"],
-            "task_id": task_entry["id"],
-            "task_type": task_entry["type"]
-        }
-        
-        agent_memory["entries"].append(task_log)
+        agent_memory["entries"].append(TaskLogEntry(
+            id=_next_entry_id(agent_memory),
+            timestamp=task_entry["timestamp"],
+            content=f"Task: {task_entry['task']}",
+            source=task_entry["source"],
+            action_type="task_assigned",
+            agent_id=agent_name,
+            task_id=task_entry["id"],
+            task_type=task_entry["type"]
+        ))
         
-        # Add to access log
-        access_entry = {
-            "timestamp": task_entry["timestamp"],
-            "action": "task_routed",
-            "details": f"Task '{task_entry['task'][:50]}...' assigned to {agent_name}",
-            "source": "task_router"
-        }
-        agent_memory["access_log"].append(access_entry)
+        _append_access(agent_memory, Action.TASK_ROUTED, (task_entry["id"], task_entry["task"], agent_name),
+                       task_entry["timestamp"])
 
 def generate_task_response(task_entry):
     """Generate appropriate response for task assignment"""
@@ -883,25 +1023,30 @@ def generate_task_response(task_entry):
     all_capabilities = core_capabilities + special_capabilities
     
     # Simple keyword matching for capability assessment
-    task_keywords = task.lower().split()
+    task_keywords = set(task.lower().split())
     matching_capabilities = []
     
     for capability in all_capabilities:
-        capability_words = capability.replace("_", " ").split()
-        if any(word in task_keywords for word in capability_words):
+        if any(word in task_keywords for word in _specialty_words(capability)):
             matching_capabilities.append(capability)
     
     if matching_capabilities:
-        response = f"✅ **Task Accepted by {agent_name}**\n\n"
-        response += f"**Task:** {task}\n"
-        response += f"**Relevant capabilities:** {', '.join(matching_capabilities[:3])}\n"
-        response += f"**Status:** Ready to execute"
+        response = "\n".join((
+            f"✅ **Task Accepted by {agent_name}**",
+            "",
+            f"**Task:** {task}",
+            f"**Relevant capabilities:** {', '.join(matching_capabilities[:3])}",
+            "**Status:** Ready to execute"
+        ))
         task_entry["status"] = "accepted"
     else:
-        response = f"❓ **Request Clarification - {agent_name}**\n\n"
-        response += f"**Task:** {task}\n"
-        response += f"**Available capabilities:** {', '.join(all_capabilities[:5])}\n"
-        response += f"**Status:** Needs more specific instructions"
+        response = "\n".join((
+            f"❓ **Request Clarification - {agent_name}**",
+            "",
+            f"**Task:** {task}",
+            f"**Available capabilities:** {', '.join(all_capabilities[:5])}",
+            "**Status:** Needs more specific instructions"
+        ))
         task_entry["status"] = "needs_clarification"
     
     task_entry["response"] = response
@@ -909,7 +1054,7 @@ def generate_task_response(task_entry):
 
 def enable_task_routing():
     """Enable complete multi-agent task routing system"""
-    agents = ["Jenny", "Luna", "Demo", "Cannon", "Bob the Builder", "Lexi", "Ava"]
+    agents = CORE_AGENTS
     results = []
     
     # Setup core systems
@@ -921,9 +1066,7 @@ def enable_task_routing():
     
     # Enable task logging for all agents
     for agent in agents:
-        memory_key = create_agent_memory_space(agent)
-        if memory_key in st.session_state:
-            st.session_state[memory_key]["task_routing_enabled"] = True
+        _ensure_memory_space(agent)["task_routing_enabled"] = True
     
     results.append("✅ Task logging enabled for all agents")
     results.append("✅ Cross-agent task chain support enabled")
@@ -935,47 +1078,81 @@ def enable_task_routing():
 # =========================
 # AGENT ROLE AWARENESS & SMART REDIRECTION SYSTEM
 # =========================
+AGENT_SPECIALTIES = MappingProxyType({
+    "Demo": ("cybersecurity", "scanning", "vulnerability_detection", "code_analysis"),
+    "Bob the Builder": ("agent_creation", "app_development", "deployment", "api_wiring"),
+    "Lexi": ("social_media", "branding", "content_creation", "marketing"),
+    "Jenny": ("communication", "marketing", "reminders", "customer_followup"),
+    "Luna": ("organization", "calendar", "scheduling", "email_tracking"),
+    "Cannon": ("automation", "command_execution", "script_execution"),
+    "Ava": ("compliance", "legal_review", "policy_scanning", "contract_parsing")
+})
+
+@functools.lru_cache(maxsize=1024)
+def _specialty_words(specialty: str) -> tuple:
+    """"api_wiring" -> ("api", "wiring")"""
+    return tuple(specialty.replace("_", " ").split())
+
+def _build_specialty_masks(specialties_by_agent: dict):
+    """Give each specialty word a bit; return (word -> bit, agent -> mask, agent -> ((specialty, mask), ...))"""
+    word_bits, agent_masks, specialty_masks = {}, {}, {}
+    for agent_name, specialties in specialties_by_agent.items():
+        agent_mask = 0
+        per_specialty = []
+        for specialty in specialties:
+            mask = 0
+            for word in _specialty_words(specialty):
+                mask |= word_bits.setdefault(word, 1 << len(word_bits))
+            per_specialty.append((specialty, mask))
+            agent_mask |= mask
+        agent_masks[agent_name] = agent_mask
+        specialty_masks[agent_name] = tuple(per_specialty)
+    return word_bits, agent_masks, specialty_masks
+
+_SPECIALTY_WORD_BITS, _AGENT_SPECIALTY_MASK, _SPECIALTY_MASKS = _build_specialty_masks(AGENT_SPECIALTIES)
 
 def set_agent_primary_domains(agent_name: str, specialties: list):
     """Set primary domain specialties for an agent"""
-    memory_key = create_agent_memory_space(agent_name)
-    if memory_key in st.session_state:
-        agent_memory = st.session_state[memory_key]
-        agent_memory["primary_domains"] = specialties
-        agent_memory["role_awareness_enabled"] = True
-        
-        # Log domain assignment
-        domain_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "action": "primary_domains_set",
-            "domains": specialties,
-            "agent": agent_name
-        }
-        agent_memory["logs"] = agent_memory.get("logs", [])
-        agent_memory["logs"].append(domain_entry)
+    agent_memory = _ensure_memory_space(agent_name)
+    agent_memory["primary_domains"] = specialties
+    agent_memory["role_awareness_enabled"] = True
+    
+    _append_access(agent_memory, Action.DOMAINS_SET, tuple(specialties))
     
     return f"✅ Set primary domains for {agent_name}: {', '.join(specialties)}"
 
-def analyze_task_fit(agent_name: str, task: str):
+@functools.lru_cache(maxsize=2048)
+def _task_key(task: str) -> str:
+    """Normalized task text shared by the fit scorers (and their caches)"""
+    return task.lower().strip()
+
+def analyze_task_fit(agent_name: str, task: str, *, task_key: str = None):
     """Analyze how well a task fits an agent's specialties"""
-    memory_key = f"{agent_name.lower()}_memory"
-    if memory_key not in st.session_state:
+    agent_memory = _agent_memory(agent_name)
+    if agent_memory is None:
         return {"fit_score": 0.5, "matching_domains": [], "suggestions": []}
     
-    agent_memory = st.session_state[memory_key]
-    primary_domains = agent_memory.get("primary_domains", [])
+    primary_domains = agent_memory["primary_domains"]
     
     if not primary_domains:
         return {"fit_score": 0.5, "matching_domains": [], "suggestions": []}
     
+    fit_score, matching_domains = _score_task_fit(task_key or _task_key(task), tuple(primary_domains))
+    return {
+        "fit_score": fit_score,
+        "matching_domains": list(matching_domains),
+        "agent_domains": primary_domains
+    }
+
+@functools.lru_cache(maxsize=4096)
+def _score_task_fit(task_lower: str, primary_domains: tuple) -> tuple:
+    """(fit_score, matching_domains) for a normalized task; pure, so cached"""
     # Analyze task keywords against agent domains
-    task_lower = task.lower()
     task_keywords = task_lower.split()
     
     matching_domains = []
     for domain in primary_domains:
-        domain_words = domain.replace("_", " ").split()
-        if any(word in task_lower for word in domain_words):
+        if any(word in task_lower for word in _specialty_words(domain)):
             matching_domains.append(domain)
     
     # Calculate fit score
@@ -990,54 +1167,54 @@ def analyze_task_fit(agent_name: str, task: str):
                     break
         fit_score = min(related_matches * 0.2, 0.4)  # Lower score for partial matches
     
-    return {
-        "fit_score": fit_score,
-        "matching_domains": matching_domains,
-        "agent_domains": primary_domains
-    }
+    return fit_score, tuple(matching_domains)
 
-def find_better_agent_for_task(task: str, current_agent: str):
+def find_better_agent_for_task(task: str, current_agent: str, *, task_key: str = None):
     """Find a better agent for a task based on specialties"""
-    agent_specialties = {
-        "Demo": ["cybersecurity", "scanning", "vulnerability_detection", "code_analysis"],
-        "Bob the Builder": ["agent_creation", "app_development", "deployment", "api_wiring"],
-        "Lexi": ["social_media", "branding", "content_creation", "marketing"],
-        "Jenny": ["communication", "marketing", "reminders", "customer_followup"],
-        "Luna": ["organization", "calendar", "scheduling", "email_tracking"],
-        "Cannon": ["automation", "command_execution", "script_execution"],
-        "Ava": ["compliance", "legal_review", "policy_scanning", "contract_parsing"]
+    best = _best_alternate_agent(task_key or _task_key(task), current_agent)
+    if best is None:
+        return None
+    agent_name, score, matching_specialties = best
+    return {
+        "agent": agent_name,
+        "score": score,
+        "matching_specialties": list(matching_specialties),
+        "all_specialties": list(AGENT_SPECIALTIES[agent_name])
     }
-    
-    best_agent = None
+
+def bulk_score_tasks(tasks: list):
+    """Specialty-fit scores for a batch of tasks (audit-log replay) -> (agents, scores[len(tasks), len(agents)])"""
+    from task_scoring import bulk_score_tasks as _bulk_score_tasks
+    return _bulk_score_tasks(tasks, AGENT_SPECIALTIES)
+
+@functools.lru_cache(maxsize=4096)
+def _best_alternate_agent(task_lower: str, current_agent: str):
+    """(agent, score, matching_specialties) of the best other agent, or None below 0.3"""
     best_score = 0
-    best_match_info = {}
-    
-    task_lower = task.lower()
+    best_match = None
+    
+    # Each distinct specialty word is tested once; matching is then bit arithmetic
+    task_mask = 0
+    for word, bit in _SPECIALTY_WORD_BITS.items():
+        if word in task_lower:
+            task_mask |= bit
+    if not task_mask:
+        return None
     
-    for agent_name, specialties in agent_specialties.items():
-        if agent_name == current_agent:
+    for agent_name, specialty_masks in _SPECIALTY_MASKS.items():
+        if agent_name == current_agent or not task_mask & _AGENT_SPECIALTY_MASK[agent_name]:
             continue
             
         # Calculate fit score for this agent
-        matching_specialties = []
-        for specialty in specialties:
-            specialty_words = specialty.replace("_", " ").split()
-            if any(word in task_lower for word in specialty_words):
-                matching_specialties.append(specialty)
+        matching_specialties = [specialty for specialty, mask in specialty_masks if task_mask & mask]
         
-        score = len(matching_specialties) / max(len(specialties), 1)
+        score = len(matching_specialties) / max(len(specialty_masks), 1)
         
         if score > best_score:
             best_score = score
-            best_agent = agent_name
-            best_match_info = {
-                "agent": agent_name,
-                "score": score,
-                "matching_specialties": matching_specialties,
-                "all_specialties": specialties
-            }
+            best_match = (agent_name, score, tuple(matching_specialties))
     
-    return best_match_info if best_score > 0.3 else None
+    return best_match if best_score > 0.3 else None
 
 def generate_smart_task_response(task_entry):
     """Generate smart response with role awareness and redirection"""
@@ -1045,84 +1222,84 @@ def generate_smart_task_response(task_entry):
     task = task_entry["task"]
     
     # Analyze fit for current agent
-    fit_analysis = analyze_task_fit(agent_name, task)
+    task_key = _task_key(task)
+    fit_analysis = analyze_task_fit(agent_name, task, task_key=task_key)
     fit_score = fit_analysis["fit_score"]
     
     if fit_score >= 0.6:  # Good fit
-        response = f"✅ **Task Accepted by {agent_name}**\n\n"
-        response += f"**Task:** {task}\n"
-        response += f"**Specialty Match:** {', '.join(fit_analysis['matching_domains'])}\n"
-        response += f"**Confidence:** High ({fit_score:.1%})\n"
-        response += f"**Status:** Ready to execute"
+        parts = [
+            f"✅ **Task Accepted by {agent_name}**",
+            "",
+            f"**Task:** {task}",
+            f"**Specialty Match:** {', '.join(fit_analysis['matching_domains'])}",
+            f"**Confidence:** High ({fit_score:.1%})",
+            "**Status:** Ready to execute"
+        ]
         task_entry["status"] = "accepted"
         
     elif fit_score >= 0.3:  # Moderate fit - can do but suggest better
-        better_agent = find_better_agent_for_task(task, agent_name)
+        better_agent = find_better_agent_for_task(task, agent_name, task_key=task_key)
         
-        response = f"🤔 **{agent_name} - Can Help, But Suggests Better Option**\n\n"
-        response += f"**Task:** {task}\n"
-        response += f"**My capability:** {', '.join(fit_analysis.get('agent_domains', []))}\n"
+        parts = [
+            f"🤔 **{agent_name} - Can Help, But Suggests Better Option**",
+            "",
+            f"**Task:** {task}",
+            f"**My capability:** {', '.join(fit_analysis.get('agent_domains', []))}"
+        ]
         
         if better_agent:
-            response += f"**💡 Suggestion:** {better_agent['agent']} might be better suited\n"
-            response += f"**Why:** Specializes in {', '.join(better_agent['matching_specialties'])}\n"
-            response += f"**Action:** I can proceed or redirect to {better_agent['agent']}"
+            parts.append(f"**💡 Suggestion:** {better_agent['agent']} might be better suited")
+            parts.append(f"**Why:** Specializes in {', '.join(better_agent['matching_specialties'])}")
+            parts.append(f"**Action:** I can proceed or redirect to {better_agent['agent']}")
         else:
-            response += f"**Action:** I'll do my best with this task"
+            parts.append("**Action:** I'll do my best with this task")
         
         task_entry["status"] = "accepted_with_suggestion"
         task_entry["suggested_agent"] = better_agent['agent'] if better_agent else None
         
     else:  # Poor fit - recommend redirection
-        better_agent = find_better_agent_for_task(task, agent_name)
+        better_agent = find_better_agent_for_task(task, agent_name, task_key=task_key)
         
-        response = f"🔄 **{agent_name} - Recommends Redirection**\n\n"
-        response += f"**Task:** {task}\n"
-        response += f"**My specialties:** {', '.join(fit_analysis.get('agent_domains', []))}\n"
+        parts = [
+            f"🔄 **{agent_name} - Recommends Redirection**",
+            "",
+            f"**Task:** {task}",
+            f"**My specialties:** {', '.join(fit_analysis.get('agent_domains', []))}"
+        ]
         
         if better_agent:
-            response += f"**🎯 Recommended Agent:** {better_agent['agent']}\n"
-            response += f"**Why:** Perfect match for {', '.join(better_agent['matching_specialties'])}\n"
-            response += f"**Redirect Command:** '{better_agent['agent']}, {task}'"
+            parts.append(f"**🎯 Recommended Agent:** {better_agent['agent']}")
+            parts.append(f"**Why:** Perfect match for {', '.join(better_agent['matching_specialties'])}")
+            parts.append(f"**Redirect Command:** '{better_agent['agent']}, {task}'")
             task_entry["status"] = "redirect_recommended"
             task_entry["recommended_agent"] = better_agent['agent']
         else:
-            response += f"**Status:** This task doesn't match my core capabilities\n"
-            response += f"**Suggestion:** Try a different agent or rephrase the request"
+            parts.append("**Status:** This task doesn't match my core capabilities")
+            parts.append("**Suggestion:** Try a different agent or rephrase the request")
             task_entry["status"] = "needs_clarification"
     
+    response = "\n".join(parts)
     task_entry["response"] = response
     return response
 
 def enable_agent_role_awareness():
     """Enable agent self-awareness and smart task redirection"""
-    agent_specialties = {
-        "Demo": ["cybersecurity", "scanning", "vulnerability_detection", "code_analysis"],
-        "Bob the Builder": ["agent_creation", "app_development", "deployment", "api_wiring"],
-        "Lexi": ["social_media", "branding", "content_creation", "marketing"],
-        "Jenny": ["communication", "marketing", "reminders", "customer_followup"],
-        "Luna": ["organization", "calendar", "scheduling", "email_tracking"],
-        "Cannon": ["automation", "command_execution", "script_execution"],
-        "Ava": ["compliance", "legal_review", "policy_scanning", "contract_parsing"]
-    }
-    
     results = []
     
-    for agent, specialties in agent_specialties.items():
+    for agent, specialties in AGENT_SPECIALTIES.items():
         # Set primary domains
-        domain_result = set_agent_primary_domains(agent, specialties)
+        domain_result = set_agent_primary_domains(agent, list(specialties))
         results.append(domain_result)
         
         # Enable role awareness in agent memory
-        memory_key = f"{agent.lower()}_memory"
-        if memory_key in st.session_state:
-            agent_memory = st.session_state[memory_key]
-            agent_memory["role_awareness_enabled"] = True
-            agent_memory["smart_redirection_enabled"] = True
-            agent_memory["suggestion_system_enabled"] = True
+        agent_memory = _ensure_memory_space(agent)
+        agent_memory["role_awareness_enabled"] = True
+        agent_memory["smart_redirection_enabled"] = True
+        agent_memory["suggestion_system_enabled"] = True
     
     # Update the task router to use smart responses
     st.session_state["smart_task_routing_enabled"] = True
+    _set_voice_flags(VOICE_SMART_ROUTING)
     
     results.append("✅ Smart task redirection enabled for all agents")
     results.append("✅ Helpful suggestions system activated")
@@ -1139,7 +1316,8 @@ def enable_wake_word_listener(wake_words):
     st.session_state.setdefault("voice_system_enabled", False)
     st.session_state.setdefault("wake_words", wake_words)
     st.session_state.setdefault("listening_active", False)
-    st.session_state.setdefault("voice_commands_log", [])
+    st.session_state.setdefault("voice_commands_log", deque(maxlen=VOICE_COMMANDS_LIMIT))
+    st.session_state.setdefault("voice_counter", 0)
     
     return f"✅ Wake word listener configured for: {', '.join(wake_words)}"
 
@@ -1150,68 +1328,117 @@ def enable_speech_to_text_transcriber():
     
     return "✅ Speech-to-text transcriber enabled"
 
+# Voice intents in priority order: the highest-priority intent found anywhere wins
+_INTENT_KEYWORDS = (
+    ("reminder", "remind|reminder|alert|notify"),
+    ("schedule", "schedule|calendar|meeting|appointment"),
+    ("create", "create|make|build|generate"),
+    ("scan", "scan|check|analyze|review"),
+    ("post", "post|publish|share|upload"),
+    ("search", "search|find|look for|locate"),
+    ("execute", "run|execute|start|launch")
+)
+_INTENT_PRIORITY = {intent: rank for rank, (intent, _) in enumerate(_INTENT_KEYWORDS)}
+# One union of named groups; the zero-width lookahead reports every start position,
+# so a keyword nested inside another match is still seen
+_INTENT_RE = re.compile(
+    "(?=" + "|".join(f"(?P<{intent}>{words})" for intent, words in _INTENT_KEYWORDS) + ")",
+    re.IGNORECASE
+)
+
+def _detect_intent(text: str) -> str:
+    """Highest-priority intent whose keywords occur in text (single regex scan)"""
+    best = min((_INTENT_PRIORITY[match.lastgroup] for match in _INTENT_RE.finditer(text)), default=None)
+    return "general" if best is None else _INTENT_KEYWORDS[best][0]
+
+# Agent picked for "hey agent ..." commands, by detected intent (anything else goes to Jenny)
+_INTENT_TO_AGENT = MappingProxyType({
+    "reminder": "Luna",
+    "schedule": "Luna",
+    "create": "Lexi",
+    "scan": "Demo",
+    "post": "Lexi",
+    "search": "Jenny",
+    "execute": "Cannon"
+})
+
+# Wake word -> agent; "hey ..." forms come first so they win over the bare names
+_WAKE_TO_AGENT = MappingProxyType({
+    "hey jenny": "Jenny",
+    "hey agent": "auto-select",
+    "jenny": "Jenny",
+    "luna": "Luna",
+    "lexi": "Lexi",
+    "demo": "Demo",
+    "bob": "Bob the Builder",
+    "cannon": "Cannon",
+    "ava": "Ava"
+})
+# Wake word at the start, plus the whitespace / single comma that separates it from the command
+_WAKE_RE = re.compile("^(" + "|".join(map(re.escape, _WAKE_TO_AGENT)) + r")\s*,?\s*")
+
+# Wake words anywhere in a longer transcript (whole words only), for splitting it into utterances
+_WAKE_SCAN_RE = re.compile(r"(?<!\w)(?:" + "|".join(map(re.escape, _WAKE_TO_AGENT)) + r")(?!\w)")
+
+def _build_wake_automaton():
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for wake_word in _WAKE_TO_AGENT:
+        automaton.add_word(wake_word, len(wake_word))
+    automaton.make_automaton()
+    return automaton
+
+_WAKE_AUTOMATON = _build_wake_automaton()
+
+def _wake_word_offsets(text_lower: str) -> list:
+    """Start offsets of non-overlapping whole-word wake words (leftmost, then longest)"""
+    if _WAKE_AUTOMATON is None:
+        return [m.start() for m in _WAKE_SCAN_RE.finditer(text_lower)]
+    size = len(text_lower)
+    hits = []
+    for end, length in _WAKE_AUTOMATON.iter(text_lower):
+        start = end - length + 1
+        if (start == 0 or not text_lower[start - 1].isalnum() and text_lower[start - 1] != "_") and \
+           (end + 1 == size or not text_lower[end + 1].isalnum() and text_lower[end + 1] != "_"):
+            hits.append((start, -length))
+    offsets, covered = [], 0
+    for start, neg_length in sorted(hits):
+        if start >= covered:
+            offsets.append(start)
+            covered = start - neg_length
+    return offsets
+
+def parse_voice_transcript(transcript: str) -> list:
+    """Split a long transcript at each wake word and parse every utterance with parse_voice_intent"""
+    text_lower = transcript.lower()
+    # lower() can change length for some non-ASCII text; slice the lowered copy in that case
+    source = transcript if len(text_lower) == len(transcript) else text_lower
+    starts = _wake_word_offsets(text_lower)
+    intents = []
+    for start, end in zip(starts, starts[1:] + [len(source)]):
+        voice_intent = parse_voice_intent(source[start:end])
+        if voice_intent:
+            intents.append(voice_intent)
+    return intents
+
 def parse_voice_intent(transcribed_text: str):
     """Parse voice input for agent, command, and intent"""
-    import re
-    
     text_lower = transcribed_text.lower().strip()
     
-    # Define wake word patterns
-    wake_patterns = {
-        "hey jenny": "Jenny",
-        "hey agent": "auto-select",
-        "jenny": "Jenny",
-        "luna": "Luna", 
-        "lexi": "Lexi",
-        "demo": "Demo",
-        "bob": "Bob the Builder",
-        "cannon": "Cannon",
-        "ava": "Ava"
-    }
-    
-    # Find wake word/agent
-    target_agent = None
-    for wake_word, agent in wake_patterns.items():
-        if text_lower.startswith(wake_word):
-            target_agent = agent
-            # Remove wake word from command
-            text_lower = text_lower[len(wake_word):].strip()
-            if text_lower.startswith(","):
-                text_lower = text_lower[1:].strip()
-            break
-    
-    if not target_agent:
+    # Find wake word/agent and remove it from the command
+    wake_match = _WAKE_RE.match(text_lower)
+    if not wake_match:
         return None
+    target_agent = _WAKE_TO_AGENT[wake_match.group(1)]
+    text_lower = text_lower[wake_match.end():]
     
     # Parse command intent
-    intent_patterns = {
-        "reminder": re.compile(r"(remind|reminder|alert|notify)", re.IGNORECASE),
-        "schedule": re.compile(r"(schedule|calendar|meeting|appointment)", re.IGNORECASE),
-        "create": re.compile(r"(create|make|build|generate)", re.IGNORECASE),
-        "scan": re.compile(r"(scan|check|analyze|review)", re.IGNORECASE),
-        "post": re.compile(r"(post|publish|share|upload)", re.IGNORECASE),
-        "search": re.compile(r"(search|find|look for|locate)", re.IGNORECASE),
-        "execute": re.compile(r"(run|execute|start|launch)", re.IGNORECASE)
-    }
-    
-    detected_intent = "general"
-    for intent, pattern in intent_patterns.items():
-        if pattern.search(text_lower):
-            detected_intent = intent
-            break
+    detected_intent = _detect_intent(text_lower)
     
     # Auto-select agent if not specified
     if target_agent == "auto-select":
-        agent_intent_mapping = {
-            "reminder": "Luna",
-            "schedule": "Luna", 
-            "create": "Lexi",
-            "scan": "Demo",
-            "post": "Lexi",
-            "search": "Jenny",
-            "execute": "Cannon"
-        }
-        target_agent = agent_intent_mapping.get(detected_intent, "Jenny")
+        target_agent = _INTENT_TO_AGENT.get(detected_intent, "Jenny")
     
     return {
         "target_agent": target_agent,
@@ -1227,10 +1454,11 @@ def route_voice_command_to_agent(voice_intent):
         return None
     
     timestamp = datetime.now().isoformat()
+    voice_commands_log = st.session_state.setdefault("voice_commands_log", deque(maxlen=VOICE_COMMANDS_LIMIT))
     
     # Create voice command entry
     voice_command = {
-        "id": f"voice_{len(st.session_state.get('voice_commands_log', []))}",
+        "id": f"voice_{_next_seq('voice_counter', 'voice_commands_log')}",
         "timestamp": timestamp,
         "type": "voice_command",
         "target_agent": voice_intent["target_agent"],
@@ -1243,7 +1471,7 @@ def route_voice_command_to_agent(voice_intent):
     }
     
     # Add to voice commands log
-    st.session_state.setdefault("voice_commands_log", []).append(voice_command)
+    voice_commands_log.append(voice_command)
     
     # Log to agent memory
     log_voice_command_to_agent_memory(voice_intent["target_agent"], voice_command)
@@ -1252,30 +1480,22 @@ def route_voice_command_to_agent(voice_intent):
 
 def log_voice_command_to_agent_memory(agent_name: str, voice_command: dict):
     """Log voice command to agent's memory"""
-    memory_key = f"{agent_name.lower()}_memory"
-    if memory_key in st.session_state:
-        agent_memory = st.session_state[memory_key]
-        
+    agent_memory = _agent_memory(agent_name)
+    if agent_memory is not None:
         # Add voice command to memory entries
-        voice_log = {
-            "timestamp": voice_command["timestamp"],
-            "action_type": "voice_command",
-            "content": f"Voice: {voice_command['original_text']}",
-            "source": "voice_system",
-            "command_id": voice_command["id"],
-            "intent": voice_command["intent"]
-        }
+        agent_memory["entries"].append(VoiceLogEntry(
+            id=_next_entry_id(agent_memory),
+            timestamp=voice_command["timestamp"],
+            content=f"Voice: {voice_command['original_text']}",
+            source="voice_system",
+            action_type="voice_command",
+            agent_id=agent_name,
+            command_id=voice_command["id"],
+            intent=voice_command["intent"]
+        ))
         
-        agent_memory["entries"].append(voice_log)
-        
-        # Add to access log
-        access_entry = {
-            "timestamp": voice_command["timestamp"],
-            "action": "voice_command_received",
-            "details": f"Voice command '{voice_command['command'][:50]}...' from user",
-            "source": "voice_system"
-        }
-        agent_memory["access_log"].append(access_entry)
+        _append_access(agent_memory, Action.VOICE_RECEIVED, (voice_command["id"], voice_command["command"]),
+                       voice_command["timestamp"])
 
 def generate_voice_response(voice_command):
     """Generate appropriate response for voice command"""
@@ -1287,24 +1507,30 @@ def generate_voice_response(voice_command):
     agent_config = AGENT_REGISTRY.get(agent_name, {})
     
     if agent_config:
-        response = f"🎤 **{agent_name} - Voice Command Received**\n\n"
-        response += f"**Original:** \"{voice_command['original_text']}\"\n"
-        response += f"**Parsed Command:** {command}\n"
-        response += f"**Intent:** {intent.title()}\n"
-        response += f"**Confidence:** {voice_command['confidence']:.1%}\n"
-        response += f"**Status:** Processing voice request"
+        response = "\n".join((
+            f"🎤 **{agent_name} - Voice Command Received**",
+            "",
+            f"**Original:** \"{voice_command['original_text']}\"",
+            f"**Parsed Command:** {command}",
+            f"**Intent:** {intent.title()}",
+            f"**Confidence:** {voice_command['confidence']:.1%}",
+            "**Status:** Processing voice request"
+        ))
     else:
-        response = f"🎤 **Voice Command Processed**\n\n"
-        response += f"**Command:** {voice_command['original_text']}\n"
-        response += f"**Routed to:** {agent_name}\n"
-        response += f"**Status:** Ready for execution"
+        response = "\n".join((
+            "🎤 **Voice Command Processed**",
+            "",
+            f"**Command:** {voice_command['original_text']}",
+            f"**Routed to:** {agent_name}",
+            "**Status:** Ready for execution"
+        ))
     
     voice_command["response"] = response
     return response
 
 def enable_voice_command_system():
     """Enable complete voice-activated command system"""
-    wake_words = ["Hey Jenny", "Hey Agent", "Jenny", "Luna", "Lexi", "Demo", "Bob", "Cannon", "Ava"]
+    wake_words = [wake_word.title() for wake_word in _WAKE_TO_AGENT]
     results = []
     
     # Enable core voice systems
@@ -1315,11 +1541,9 @@ def enable_voice_command_system():
     results.append(speech_result)
     
     # Enable voice routing for all agents
-    agents = ["Jenny", "Luna", "Demo", "Cannon", "Bob the Builder", "Lexi", "Ava"]
+    agents = CORE_AGENTS
     for agent in agents:
-        memory_key = create_agent_memory_space(agent)
-        if memory_key in st.session_state:
-            st.session_state[memory_key]["voice_commands_enabled"] = True
+        _ensure_memory_space(agent)["voice_commands_enabled"] = True
     
     # Set system flags
     st.session_state["voice_system_enabled"] = True
@@ -1362,35 +1586,88 @@ def process_voice_input(transcribed_text: str):
 # ENHANCED VOICE COMMAND SYSTEM V2
 # =========================
 
-def enable_voice_identification(user_voiceprint: str):
-    """Enable speaker recognition and verification"""
+MAX_VOICE_LOG = 2_000    # entries kept per voice log (enhanced commands, tier switches, ...)
+
+# Voice feature bits in session_state["_voice_flags"], so the per-command path reads one int.
+# The named *_enabled keys are still written for display.
+VOICE_ENHANCED, VOICE_VERIFICATION, VOICE_FAILOVER, VOICE_SMART_ROUTING = 1, 2, 4, 8
+
+def _set_voice_flags(bits: int):
+    st.session_state["_voice_flags"] = st.session_state.get("_voice_flags", 0) | bits
+
+def _session_log(key: str, maxlen: int = MAX_VOICE_LOG) -> deque:
+    """Bounded session_state log under key, created on first use"""
+    ss = st.session_state
+    log = ss.get(key)
+    if log is None:
+        log = ss[key] = deque(maxlen=maxlen)
+    return log
+
+def enable_voice_identification(user_voiceprint: str, reference_embedding=None):
+    """Enable speaker recognition and verification (reference_embedding: enrolled voiceprint vector, if any)"""
+    if reference_embedding is not None:
+        from voiceprint import normalize_embedding
+        st.session_state["_auth_vec_f32"] = normalize_embedding(reference_embedding)
     st.session_state.setdefault("voice_identification_enabled", True)
     st.session_state.setdefault("authorized_user_voiceprint", user_voiceprint)
     st.session_state.setdefault("voice_verification_required", True)
-    st.session_state.setdefault("unknown_voice_attempts", [])
+    _set_voice_flags(VOICE_VERIFICATION)
+    _session_log("unknown_voice_attempts")
     
     return f"✅ Voice identification enabled for user: {user_voiceprint}"
 
-def verify_speaker_identity(audio_sample=None):
-    """Verify if the speaker is authorized (placeholder implementation)"""
-    # In production, this would use actual voiceprint analysis
-    authorized_user = st.session_state.get("authorized_user_voiceprint", "Joe_Budds")
-    
-    # Placeholder verification - in real implementation would analyze audio_sample
-    verification_result = {
+@functools.lru_cache(maxsize=256)
+def _verify_voiceprint(audio_digest, authorized_user: str) -> dict:
+    """Voiceprint check for one utterance, keyed by audio digest so repeated audio skips the comparison"""
+    # Placeholder verification - in real implementation would compare the utterance embedding
+    # against the enrolled voiceprint for authorized_user
+    return {
         "is_authorized": True,  # Placeholder - would be actual voice analysis
         "confidence": 0.95,
         "user_id": authorized_user,
         "verification_method": "voiceprint_match"
     }
+
+def _is_embedding(sample) -> bool:
+    """True for an embedding vector (ndarray, list or tuple) rather than audio or a file handle"""
+    return isinstance(sample, (list, tuple)) or type(sample).__module__ == "numpy" and hasattr(sample, "shape")
+
+def verify_speaker_identity(audio_sample=None):
+    """Verify if the speaker is authorized (placeholder implementation)"""
+    authorized_user = st.session_state.get("authorized_user_voiceprint", "Joe_Budds")
+    
+    # Precomputed embeddings (arrays / number sequences) are scored against the enrolled voiceprint;
+    # other samples (raw audio, file handles) take the placeholder path below
+    reference = st.session_state.get("_auth_vec_f32")
+    if reference is not None and _is_embedding(audio_sample):
+        from voiceprint import MATCH_THRESHOLD, cosine_score
+        try:
+            score = cosine_score(reference, audio_sample)
+        except (TypeError, ValueError):
+            # Wrong dimension or non-numeric values: not a usable voiceprint, so not a match
+            score = 0.0
+        return {
+            "is_authorized": score >= MATCH_THRESHOLD,
+            "confidence": score,
+            "user_id": authorized_user,
+            "verification_method": "embedding_cosine"
+        }
     
-    return verification_result
+    # Raw audio is hashed once; anything else (no sample, file handles) isn't cached by content
+    if isinstance(audio_sample, (bytes, bytearray, memoryview)):
+        digest = hashlib.blake2b(audio_sample, digest_size=16).digest()
+    else:
+        digest = None
+    
+    # Copy so callers can't mutate the cached result
+    return dict(_verify_voiceprint(digest, authorized_user))
 
 def enable_enhanced_wake_word_listener(wake_words, group_wake_word, silence_timeout_seconds):
     """Enhanced wake word detection with group mode and timeout"""
     st.session_state.setdefault("enhanced_voice_system_enabled", False)
     st.session_state.setdefault("wake_words_enhanced", wake_words)
     st.session_state.setdefault("group_wake_word", group_wake_word)
+    st.session_state["_group_wake_lc"] = st.session_state["group_wake_word"].lower()
     st.session_state.setdefault("silence_timeout", silence_timeout_seconds)
     st.session_state.setdefault("listening_session_active", False)
     st.session_state.setdefault("last_voice_input_time", None)
@@ -1400,13 +1677,17 @@ def enable_enhanced_wake_word_listener(wake_words, group_wake_word, silence_time
 
 def process_enhanced_voice_input(transcribed_text: str, audio_sample=None):
     """Enhanced voice processing with verification and logging"""
-    if not st.session_state.get("enhanced_voice_system_enabled", False):
+    ss = st.session_state
+    flags = ss.get("_voice_flags", 0)
+    if not flags & VOICE_ENHANCED:
         return None
     
-    timestamp = datetime.now().isoformat()
+    now = datetime.now()
+    timestamp = now.isoformat()
     
     # Verify speaker identity
-    if st.session_state.get("voice_verification_required", True):
+    verification = {"is_authorized": True, "confidence": 0.0, "user_id": "unknown", "verification_method": "not_required"}
+    if flags & VOICE_VERIFICATION:
         verification = verify_speaker_identity(audio_sample)
         if not verification["is_authorized"]:
             # Log unauthorized attempt
@@ -1416,7 +1697,7 @@ def process_enhanced_voice_input(transcribed_text: str, audio_sample=None):
                 "verification_confidence": verification["confidence"],
                 "status": "rejected_unauthorized"
             }
-            st.session_state.setdefault("unknown_voice_attempts", []).append(unauthorized_attempt)
+            _session_log("unknown_voice_attempts").append(unauthorized_attempt)
             
             return {
                 "status": "unauthorized",
@@ -1425,12 +1706,13 @@ def process_enhanced_voice_input(transcribed_text: str, audio_sample=None):
             }
     
     # Update last input time for silence tracking
-    st.session_state["last_voice_input_time"] = datetime.now().timestamp()
-    st.session_state["listening_session_active"] = True
+    ss["last_voice_input_time"] = now.timestamp()
+    ss["_silence_deadline"] = time.monotonic() + ss.get("silence_timeout", 45)
+    ss["listening_session_active"] = True
     
     # Check for group activation
-    group_wake_word = st.session_state.get("group_wake_word", "Hey Agents")
-    if transcribed_text.lower().startswith(group_wake_word.lower()):
+    group_wake_lc = ss.get("_group_wake_lc") or ss.get("group_wake_word", "Hey Agents").lower()
+    if transcribed_text.lower().startswith(group_wake_lc):
         return process_group_voice_command(transcribed_text, timestamp, verification)
     
     # Process individual agent command
@@ -1439,8 +1721,9 @@ def process_enhanced_voice_input(transcribed_text: str, audio_sample=None):
         return None
     
     # Enhanced logging with audio reference
+    voice_log = _session_log("enhanced_voice_log")
     voice_command = {
-        "id": f"voice_enhanced_{len(st.session_state.get('enhanced_voice_log', []))}",
+        "id": f"voice_enhanced_{_next_seq('enhanced_voice_counter', 'enhanced_voice_log')}",
         "timestamp": timestamp,
         "type": "voice_command_enhanced",
         "target_agent": voice_intent["target_agent"],
@@ -1456,16 +1739,16 @@ def process_enhanced_voice_input(transcribed_text: str, audio_sample=None):
     }
     
     # Log to enhanced voice system
-    st.session_state.setdefault("enhanced_voice_log", []).append(voice_command)
+    voice_log.append(voice_command)
     
     # Log to agent memory with enhanced details
     log_enhanced_voice_to_agent_memory(voice_intent["target_agent"], voice_command)
     
     # Generate enhanced response
-    response = generate_enhanced_voice_response(voice_command)
+    response = generate_enhanced_voice_response(voice_command, now)
     
     # Log agent's thought process
-    log_agent_thought_process(voice_intent["target_agent"], voice_command, response)
+    log_agent_thought_process(voice_intent["target_agent"], voice_command, response, now)
     
     return {
         "status": "processed",
@@ -1487,18 +1770,15 @@ def process_group_voice_command(transcribed_text: str, timestamp: str, verificat
     # Activate group mode
     st.session_state["group_mode_active"] = True
     
-    # Determine which agent should respond
+    # Jenny coordinates group commands
+    responding_agent = "Jenny"
     if not command_text:
-        responding_agent = "Jenny"  # Default coordinator
         command_text = "coordinate group response"
-    else:
-        # Parse for specific routing or let Jenny coordinate
-        voice_intent = parse_voice_intent(f"Jenny, {command_text}")
-        responding_agent = voice_intent["target_agent"] if voice_intent else "Jenny"
     
     # Create group command entry
+    voice_log = _session_log("enhanced_voice_log")
     group_command = {
-        "id": f"group_voice_{len(st.session_state.get('enhanced_voice_log', []))}",
+        "id": f"group_voice_{_next_seq('enhanced_voice_counter', 'enhanced_voice_log')}",
         "timestamp": timestamp,
         "type": "group_voice_command",
         "responding_agent": responding_agent,
@@ -1511,18 +1791,23 @@ def process_group_voice_command(transcribed_text: str, timestamp: str, verificat
     }
     
     # Log to enhanced voice system
-    st.session_state.setdefault("enhanced_voice_log", []).append(group_command)
-    
-    # Log to all agent memories
-    all_agents = ["Jenny", "Luna", "Demo", "Cannon", "Bob the Builder", "Lexi", "Ava"]
-    for agent in all_agents:
-        log_enhanced_voice_to_agent_memory(agent, group_command)
-    
-    response = f"🎤 **Group Command Received**\n\n"
-    response += f"**Command:** {transcribed_text}\n"
-    response += f"**All agents listening, {responding_agent} coordinating response**\n"
-    response += f"**Group Mode:** Active\n"
-    response += f"**Status:** Processing group request"
+    voice_log.append(group_command)
+    
+    # Log to all agent memories. One entry object is shared by every agent: appended
+    # entries are never modified and eviction only drops them (see LogEntry)
+    entry, meta = _enhanced_voice_entry(group_command)
+    for agent, memory_key in _CORE_AGENT_KEYS:
+        agent_memory = _agent_memory(agent, memory_key)
+        if agent_memory is not None:
+            _append_enhanced_voice(agent_memory, entry, meta, group_command["timestamp"])
+    
+    response = "\n".join([
+        "🎤 **Group Command Received**\n",
+        f"**Command:** {transcribed_text}",
+        f"**All agents listening, {responding_agent} coordinating response**",
+        "**Group Mode:** Active",
+        "**Status:** Processing group request"
+    ])
     
     return {
         "status": "group_processed",
@@ -1532,45 +1817,38 @@ def process_group_voice_command(transcribed_text: str, timestamp: str, verificat
         "group_mode": True
     }
 
+def _enhanced_voice_entry(voice_command: dict):
+    """(memory entry, access meta) for an enhanced voice command"""
+    entry = {
+        "timestamp": voice_command["timestamp"],
+        "action_type": "enhanced_voice_command",
+        "content": f"Voice: {voice_command.get('original_text', voice_command.get('command', 'Unknown'))}",
+        "source": "enhanced_voice_system",
+        "command_id": voice_command["id"],
+        "intent": voice_command.get("intent", "group_coordination"),
+        "speaker_verified": voice_command.get("speaker_verified", False),
+        "group_mode": voice_command.get("group_mode", False)
+    }
+    return entry, (voice_command["id"], entry["speaker_verified"])
+
+def _append_enhanced_voice(agent_memory: dict, entry: dict, meta: tuple, timestamp: str):
+    agent_memory["entries"].append(entry)
+    _append_access(agent_memory, Action.ENHANCED_VOICE_RECEIVED, meta, timestamp)
+
 def log_enhanced_voice_to_agent_memory(agent_name: str, voice_command: dict):
     """Enhanced voice logging to agent memory"""
-    memory_key = f"{agent_name.lower()}_memory"
-    if memory_key in st.session_state:
-        agent_memory = st.session_state[memory_key]
-        
-        # Enhanced voice log entry
-        voice_log = {
-            "timestamp": voice_command["timestamp"],
-            "action_type": "enhanced_voice_command",
-            "content": f"Voice: {voice_command.get('original_text', voice_command.get('command', 'Unknown'))}",
-            "source": "enhanced_voice_system",
-            "command_id": voice_command["id"],
-            "intent": voice_command.get("intent", "group_coordination"),
-            "speaker_verified": voice_command.get("speaker_verified", False),
-            "group_mode": voice_command.get("group_mode", False)
-        }
-        
-        agent_memory["entries"].append(voice_log)
-        
-        # Enhanced access log
-        access_entry = {
-            "timestamp": voice_command["timestamp"],
-            "action": "enhanced_voice_received",
-            "details": f"Voice: '{voice_command.get('command', 'group command')[:50]}...' from verified user",
-            "source": "enhanced_voice_system",
-            "security_verified": voice_command.get("speaker_verified", False)
-        }
-        agent_memory["access_log"].append(access_entry)
-
-def log_agent_thought_process(agent_name: str, voice_command: dict, response: str):
-    """Log agent's internal thought process and decision making"""
-    memory_key = f"{agent_name.lower()}_memory"
-    if memory_key in st.session_state:
-        agent_memory = st.session_state[memory_key]
-        
+    agent_memory = _agent_memory(agent_name)
+    if agent_memory is not None:
+        entry, meta = _enhanced_voice_entry(voice_command)
+        _append_enhanced_voice(agent_memory, entry, meta, voice_command["timestamp"])
+
+def log_agent_thought_process(agent_name: str, voice_command: dict, response: str, now: datetime = None):
+    """Log agent's internal thought process and decision making (now: the command's clock reading)"""
+    agent_memory = _agent_memory(agent_name)
+    if agent_memory is not None:
         # Agent thought log
         thought_entry = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": (now or datetime.now()).isoformat(),
             "action_type": "agent_thought_process",
             "content": f"Processing voice command: analyzed intent '{voice_command.get('intent', 'unknown')}', generated response strategy",
             "source": "agent_cognition",
@@ -1582,77 +1860,98 @@ def log_agent_thought_process(agent_name: str, voice_command: dict, response: st
         # Add to specialized thought log
         agent_memory.setdefault("thought_log", []).append(thought_entry)
 
-def generate_enhanced_voice_response(voice_command):
-    """Generate enhanced response with thought process"""
+def render_voice_command_md(voice_command: dict) -> str:
+    """Markdown body for an enhanced voice command, built from its fields (before voice output)"""
     agent_name = voice_command["target_agent"]
-    command = voice_command["command"]
-    intent = voice_command["intent"]
     
-    # Use smart response if role awareness is enabled
-    if st.session_state.get("smart_task_routing_enabled", False):
-        # Create task entry for smart response
-        task_entry = {
+    # Use smart response if role awareness was enabled for the command
+    if voice_command.get("smart_response"):
+        base_response = generate_smart_task_response({
             "target_agent": agent_name,
-            "task": command,
+            "task": voice_command["command"],
             "type": "voice_command",
             "timestamp": voice_command["timestamp"]
-        }
-        base_response = generate_smart_task_response(task_entry)
+        })
     else:
         # Basic enhanced response
-        base_response = f"🎤 **{agent_name} - Enhanced Voice Response**\n\n"
-        base_response += f"**Command:** {voice_command['original_text']}\n"
-        base_response += f"**Intent:** {intent.title()}\n"
-        base_response += f"**Confidence:** {voice_command['confidence']:.1%}\n"
-        base_response += f"**Status:** Processing voice request"
-    
-    # Add enhanced features
-    enhanced_response = f"🔊 **Enhanced Voice Processing**\n"
-    enhanced_response += f"**Speaker:** ✅ Verified ({voice_command.get('user_id', 'Unknown')})\n"
-    enhanced_response += f"**Audio Sample:** {'📁 Saved' if voice_command.get('has_audio_sample') else '📝 Text only'}\n"
-    enhanced_response += f"**Processing Time:** {datetime.now().strftime('%H:%M:%S')}\n\n"
-    enhanced_response += base_response
+        base_response = "\n".join([
+            f"🎤 **{agent_name} - Enhanced Voice Response**\n",
+            f"**Command:** {voice_command['original_text']}",
+            f"**Intent:** {voice_command['intent'].title()}",
+            f"**Confidence:** {voice_command['confidence']:.1%}",
+            "**Status:** Processing voice request"
+        ])
+    
+    parts = [
+        "🔊 **Enhanced Voice Processing**",
+        f"**Speaker:** ✅ Verified ({voice_command.get('user_id', 'Unknown')})",
+        f"**Audio Sample:** {'📁 Saved' if voice_command.get('has_audio_sample') else '📝 Text only'}",
+        f"**Processing Time:** {voice_command['processing_time']}\n",
+        base_response
+    ]
+    
+    return "\n".join(parts)
+
+def _with_voice_output_md(text: str, voice_output: dict) -> str:
+    parts = [
+        text + "\n",
+        "🎵 **Voice Output Generated**",
+        f"**Voice Engine:** {voice_output['voice_engine']} (Tier {voice_output['tier']})",
+        f"**Style:** {voice_output['style'].title()}",
+        f"**Characters:** {voice_output['chars_processed']}"
+    ]
+    if voice_output.get("emergency_fallback"):
+        parts.append("**⚠️ Emergency Fallback Used**")
+    return "\n".join(parts)
+
+def generate_enhanced_voice_response(voice_command, now: datetime = None):
+    """Generate enhanced response with thought process.
+
+    The rendered text is stored as voice_command["response"]: the smart response
+    depends on live agent state, so re-rendering later could show different text.
+    """
+    flags = st.session_state.get("_voice_flags", 0)
+    voice_command["processing_time"] = (now or datetime.now()).strftime('%H:%M:%S')
+    voice_command["smart_response"] = bool(flags & VOICE_SMART_ROUTING)
+    
+    response = render_voice_command_md(voice_command)
     
     # Generate voice output if tiered voice system is enabled
-    if st.session_state.get("voice_engine_failover_enabled", False):
-        voice_result = generate_agent_voice_output(agent_name, enhanced_response)
+    if flags & VOICE_FAILOVER:
+        voice_result = generate_agent_voice_output(voice_command["target_agent"], response)
         if voice_result.get("success"):
-            enhanced_response += f"\n\n🎵 **Voice Output Generated**\n"
-            enhanced_response += f"**Voice Engine:** {voice_result['voice_engine']} (Tier {voice_result['tier']})\n"
-            enhanced_response += f"**Style:** {voice_result['style'].title()}\n"
-            enhanced_response += f"**Characters:** {voice_result['chars_processed']}"
-            
-            if voice_result.get("emergency_fallback"):
-                enhanced_response += f"\n**⚠️ Emergency Fallback Used**"
+            voice_output = voice_command["voice_output"] = {
+                "voice_engine": voice_result["voice_engine"],
+                "tier": voice_result["tier"],
+                "style": voice_result["style"],
+                "chars_processed": voice_result["chars_processed"],
+                "emergency_fallback": voice_result.get("emergency_fallback", False)
+            }
+            response = _with_voice_output_md(response, voice_output)
     
-    voice_command["response"] = enhanced_response
-    return enhanced_response
+    voice_command["response"] = response
+    return response
 
 def check_silence_timeout():
-    """Check if silence timeout has been reached"""
-    if not st.session_state.get("listening_session_active", False):
-        return False
-    
-    last_input_time = st.session_state.get("last_voice_input_time")
-    if not last_input_time:
+    """Check if silence timeout has been reached (cheap enough to call on every rerun)"""
+    ss = st.session_state
+    if not ss.get("listening_session_active", False):
         return False
     
-    timeout_seconds = st.session_state.get("silence_timeout", 45)
-    current_time = datetime.now().timestamp()
-    
-    if current_time - last_input_time > timeout_seconds:
+    # Deadline is set on each voice input from the monotonic clock, so wall-clock jumps don't matter
+    if time.monotonic() > ss.get("_silence_deadline", float("inf")):
         # Auto-suspend due to silence
-        st.session_state["listening_session_active"] = False
-        st.session_state["group_mode_active"] = False
+        ss["listening_session_active"] = False
+        ss["group_mode_active"] = False
         
         # Log timeout event
         timeout_log = {
             "timestamp": datetime.now().isoformat(),
             "event": "silence_timeout",
-            "timeout_duration": timeout_seconds,
+            "timeout_duration": ss.get("silence_timeout", 45),
             "auto_suspended": True
         }
-        st.session_state.setdefault("voice_session_log", []).append(timeout_log)
+        _session_log("voice_session_log").append(timeout_log)
         
         return True
     
@@ -1674,7 +1973,7 @@ def enable_enhanced_voice_command_system():
     results.append(voice_id_result)
     
     # Enable enhanced features for all agents
-    agents = ["Jenny", "Luna", "Demo", "Cannon", "Bob the Builder", "Lexi", "Ava"]
+    agents = CORE_AGENTS
     for agent in agents:
         memory_key = create_agent_memory_space(agent)
         if memory_key in st.session_state:
@@ -1691,6 +1990,7 @@ def enable_enhanced_voice_command_system():
     st.session_state["silence_auto_suspend"] = True
     st.session_state["agent_thought_logging"] = True
     st.session_state["comprehensive_voice_logging"] = True
+    _set_voice_flags(VOICE_ENHANCED | VOICE_VERIFICATION)
     
     results.append("✅ Speaker recognition and user verification enabled")
     results.append("✅ Group activation mode 'Hey Agents' enabled") 
@@ -1705,23 +2005,69 @@ def enable_enhanced_voice_command_system():
 # TIERED VOICE ENGINE SYSTEM WITH PERSONALITY MATCHING
 # =========================
 
+def _bump_voice_state():
+    """Invalidate the cached voice health report"""
+    st.session_state["_voice_state_version"] = st.session_state.get("_voice_state_version", 0) + 1
+
+@dataclass(slots=True)
+class VoiceProfile:
+    """An agent's voice tiers and current position in them.
+
+    profile["current_tier"] / profile.get(...) still work for dict-style readers;
+    to_dict() gives the old nested shape for JSON display.
+    """
+    agent: str
+    style: str
+    tiers: tuple
+    current_tier: int = 0  # Start with Tier 1
+    current_voice: str = ""
+    style_description: str = ""
+    fallback_count: int = 0
+    successful_generations: int = 0
+    failed_attempts: int = 0
+    # (engine, daily quota checks) per tier, resolved at assignment
+    tier_quota_checks: tuple = ()
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    @property
+    def usage_stats(self) -> dict:
+        return {"successful_generations": self.successful_generations, "failed_attempts": self.failed_attempts}
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        del data["tier_quota_checks"]
+        data["tiers"] = list(self.tiers)
+        data["usage_stats"] = {
+            "successful_generations": data.pop("successful_generations"),
+            "failed_attempts": data.pop("failed_attempts")
+        }
+        return data
+
 def assign_agent_voice_profiles(agent_voice_config):
     """Assign voice profiles with tiered fallback options to each agent"""
     st.session_state.setdefault("agent_voice_profiles", {})
     st.session_state.setdefault("voice_api_usage", {})
-    st.session_state.setdefault("voice_tier_switches", [])
+    _session_log("voice_tier_switches")
     
     for agent_name, config in agent_voice_config.items():
-        voice_profile = {
-            "agent": agent_name,
-            "style": config["style"],
-            "tiers": config["tiers"],
-            "current_tier": 0,  # Start with Tier 1
-            "current_voice": config["tiers"][0],
-            "style_description": get_voice_style_description(config["style"]),
-            "fallback_count": 0,
-            "usage_stats": {"successful_generations": 0, "failed_attempts": 0}
-        }
+        voice_profile = VoiceProfile(
+            agent=agent_name,
+            style=config["style"],
+            tiers=tuple(config["tiers"]),
+            current_voice=config["tiers"][0],
+            style_description=get_voice_style_description(config["style"]),
+            tier_quota_checks=tuple(
+                (engine, _DAILY_QUOTA_CHECKS.get(engine, _DEFAULT_DAILY_QUOTA_CHECKS)) for engine in config["tiers"]
+            )
+        )
         
         st.session_state["agent_voice_profiles"][agent_name] = voice_profile
         
@@ -1736,108 +2082,124 @@ def assign_agent_voice_profiles(agent_voice_config):
                     "tier_level": get_tier_level(tier_voice)
                 }
     
+    _bump_voice_state()
     return f"✅ Voice profiles assigned to {len(agent_voice_config)} agents with tiered fallback"
 
+_VOICE_STYLE_DESCRIPTIONS = MappingProxyType({
+    "friendly": "Warm, approachable, and expressive tone",
+    "calm": "Steady, organized, and soothing voice",
+    "technical": "Clear, precise, and authoritative delivery",
+    "clear": "Direct, commanding, and confident tone",
+    "casual": "Relaxed, helpful, and conversational style",
+    "upbeat": "Energetic, enthusiastic, and positive tone",
+    "professional": "Polished, composed, and business-appropriate"
+})
+
+# Shared across callers - treat the quota dicts as read-only
+_VOICE_QUOTA_LIMITS = MappingProxyType({
+    # Tier 1 - Premium APIs
+    "elevenlabs": {"daily_chars": 10000, "monthly_chars": 250000},
+    "azure:cora": {"daily_requests": 500, "monthly_requests": 15000},
+    "google:neural_male": {"daily_chars": 4000000, "monthly_chars": 100000000},
+    "playht:authority": {"daily_words": 25000, "monthly_words": 750000},
+    "azure:benjamin": {"daily_requests": 500, "monthly_requests": 15000},
+    "google:friendly_female": {"daily_chars": 4000000, "monthly_chars": 100000000},
+    "elevenlabs:olivia": {"daily_chars": 10000, "monthly_chars": 250000},
+    
+    # Tier 2 - Secondary services
+    "playht": {"daily_words": 10000, "monthly_words": 300000},
+    
+    # Tier 3 - Local voices (unlimited)
+    "mac:samantha": {"unlimited": True},
+    "mac:karen": {"unlimited": True},
+    "mac:alex": {"unlimited": True},
+    "mac:fred": {"unlimited": True},
+    "mac:daniel": {"unlimited": True},
+    "mac:tessa": {"unlimited": True},
+    "mac:victoria": {"unlimited": True}
+})
+_DEFAULT_VOICE_QUOTA = {"daily_requests": 100, "monthly_requests": 3000}
+
+_TIER2_VOICE_ENGINES = frozenset({"playht", "fallback"})
+
+# Daily limits as (usage field, limit, reason) in check order, resolved once per engine
+_DAILY_QUOTA_FIELDS = (
+    ("daily_chars", "tokens_used", "daily_char_limit_exceeded"),
+    ("daily_requests", "requests_today", "daily_request_limit_exceeded"),
+    ("daily_words", "tokens_used", "daily_word_limit_exceeded"),
+)
+
+def _daily_quota_checks(quota: dict):
+    """None for unlimited engines, else the tuple of daily checks that apply"""
+    if quota.get("unlimited", False):
+        return None
+    return tuple((usage_field, quota[limit_field], reason)
+                 for limit_field, usage_field, reason in _DAILY_QUOTA_FIELDS if limit_field in quota)
+
+_DAILY_QUOTA_CHECKS = MappingProxyType({engine: _daily_quota_checks(quota) for engine, quota in _VOICE_QUOTA_LIMITS.items()})
+_DEFAULT_DAILY_QUOTA_CHECKS = _daily_quota_checks(_DEFAULT_VOICE_QUOTA)
+
 def get_voice_style_description(style):
     """Get description for voice style"""
-    style_descriptions = {
-        "friendly": "Warm, approachable, and expressive tone",
-        "calm": "Steady, organized, and soothing voice",
-        "technical": "Clear, precise, and authoritative delivery",
-        "clear": "Direct, commanding, and confident tone",
-        "casual": "Relaxed, helpful, and conversational style",
-        "upbeat": "Energetic, enthusiastic, and positive tone",
-        "professional": "Polished, composed, and business-appropriate"
-    }
-    return style_descriptions.get(style, "Natural speaking voice")
+    return _VOICE_STYLE_DESCRIPTIONS.get(style, "Natural speaking voice")
 
 def get_voice_api_quota(voice_engine):
     """Get API quota limits for different voice engines"""
-    quota_limits = {
-        # Tier 1 - Premium APIs
-        "elevenlabs": {"daily_chars": 10000, "monthly_chars": 250000},
-        "azure:cora": {"daily_requests": 500, "monthly_requests": 15000},
-        "google:neural_male": {"daily_chars": 4000000, "monthly_chars": 100000000},
-        "playht:authority": {"daily_words": 25000, "monthly_words": 750000},
-        "azure:benjamin": {"daily_requests": 500, "monthly_requests": 15000},
-        "google:friendly_female": {"daily_chars": 4000000, "monthly_chars": 100000000},
-        "elevenlabs:olivia": {"daily_chars": 10000, "monthly_chars": 250000},
-        
-        # Tier 2 - Secondary services
-        "playht": {"daily_words": 10000, "monthly_words": 300000},
-        
-        # Tier 3 - Local voices (unlimited)
-        "mac:samantha": {"unlimited": True},
-        "mac:karen": {"unlimited": True},
-        "mac:alex": {"unlimited": True},
-        "mac:fred": {"unlimited": True},
-        "mac:daniel": {"unlimited": True},
-        "mac:tessa": {"unlimited": True},
-        "mac:victoria": {"unlimited": True}
-    }
-    
-    return quota_limits.get(voice_engine, {"daily_requests": 100, "monthly_requests": 3000})
+    return _VOICE_QUOTA_LIMITS.get(voice_engine, _DEFAULT_VOICE_QUOTA)
 
 def get_tier_level(voice_engine):
-    """Determine tier level for voice engine"""
+    """Determine tier level for voice engine (3 local, 2 secondary, 1 premium)"""
     if voice_engine.startswith("mac:"):
-        return 3  # Local voices
-    elif voice_engine in ["playht", "fallback"]:
-        return 2  # Secondary services
-    else:
-        return 1  # Premium APIs
+        return 3
+    return 2 if voice_engine in _TIER2_VOICE_ENGINES else 1
 
-def check_voice_api_quota(voice_engine):
-    """Check if voice API has available quota"""
+def _daily_quota_exceeded(voice_engine, checks: tuple, today: str):
+    """First daily check the engine's usage fails, or None (resets the daily request count on a new day)"""
     usage = st.session_state.get("voice_api_usage", {}).get(voice_engine, {})
-    quota = get_voice_api_quota(voice_engine)
-    
-    # Unlimited local voices
-    if quota.get("unlimited", False):
-        return {"available": True, "reason": "unlimited_local"}
-    
-    # Check daily limits
-    today = datetime.now().date().isoformat()
     if usage.get("last_reset") != today:
         # Reset daily counters
         usage["requests_today"] = 0
         usage["last_reset"] = today
+    for check in checks:
+        if usage.get(check[0], 0) >= check[1]:
+            return check
+    return None
+
+def check_voice_api_quota(voice_engine, today: str = None):
+    """Check if voice API has available quota (today: ISO date, when checking several engines at once)"""
+    checks = _DAILY_QUOTA_CHECKS.get(voice_engine, _DEFAULT_DAILY_QUOTA_CHECKS)
     
-    # Check various quota types
-    if "daily_chars" in quota and usage.get("tokens_used", 0) >= quota["daily_chars"]:
-        return {"available": False, "reason": "daily_char_limit_exceeded", "limit": quota["daily_chars"]}
-    
-    if "daily_requests" in quota and usage.get("requests_today", 0) >= quota["daily_requests"]:
-        return {"available": False, "reason": "daily_request_limit_exceeded", "limit": quota["daily_requests"]}
+    # Unlimited local voices
+    if checks is None:
+        return {"available": True, "reason": "unlimited_local"}
     
-    if "daily_words" in quota and usage.get("tokens_used", 0) >= quota["daily_words"]:
-        return {"available": False, "reason": "daily_word_limit_exceeded", "limit": quota["daily_words"]}
+    exceeded = _daily_quota_exceeded(voice_engine, checks, today or datetime.now().date().isoformat())
+    if exceeded is not None:
+        return {"available": False, "reason": exceeded[2], "limit": exceeded[1]}
     
     return {"available": True, "reason": "quota_available"}
 
 def get_best_available_voice(agent_name):
     """Get the best available voice for an agent based on quota and tiers"""
-    if agent_name not in st.session_state.get("agent_voice_profiles", {}):
+    profile = st.session_state.get("agent_voice_profiles", {}).get(agent_name)
+    if profile is None:
         return None
     
-    profile = st.session_state["agent_voice_profiles"][agent_name]
-    
     # Try each tier in order
-    for tier_index, voice_engine in enumerate(profile["tiers"]):
-        quota_check = check_voice_api_quota(voice_engine)
-        
-        if quota_check["available"]:
+    today = datetime.now().date().isoformat()
+    for tier_index, (voice_engine, checks) in enumerate(profile.tier_quota_checks):
+        if checks is None or _daily_quota_exceeded(voice_engine, checks, today) is None:
             # Update profile if we switched tiers
-            if tier_index != profile["current_tier"]:
-                log_voice_tier_switch(agent_name, profile["current_tier"], tier_index, voice_engine)
-                profile["current_tier"] = tier_index
-                profile["current_voice"] = voice_engine
-                profile["fallback_count"] += 1
+            if tier_index != profile.current_tier:
+                log_voice_tier_switch(agent_name, profile.current_tier, tier_index, voice_engine)
+                profile.current_tier = tier_index
+                profile.current_voice = voice_engine
+                profile.fallback_count += 1
             
             return {
                 "voice_engine": voice_engine,
                 "tier": tier_index + 1,
-                "style": profile["style"],
+                "style": profile.style,
                 "available": True
             }
     
@@ -1850,10 +2212,16 @@ def get_best_available_voice(agent_name):
         "emergency_fallback": True
     }
 
+def _drop_before_day(timestamps: deque, day_iso: str):
+    """Evict ISO timestamps older than day_iso from the left (timestamps are appended in order)"""
+    while timestamps and timestamps[0][:10] != day_iso:
+        timestamps.popleft()
+
 def log_voice_tier_switch(agent_name, old_tier, new_tier, new_voice):
     """Log when an agent switches voice tiers"""
+    now = datetime.now()
     switch_log = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now.isoformat(),
         "agent": agent_name,
         "old_tier": old_tier + 1,
         "new_tier": new_tier + 1,
@@ -1861,13 +2229,15 @@ def log_voice_tier_switch(agent_name, old_tier, new_tier, new_voice):
         "reason": "quota_exceeded" if new_tier > old_tier else "quota_restored"
     }
     
-    st.session_state.setdefault("voice_tier_switches", []).append(switch_log)
+    _session_log("voice_tier_switches").append(switch_log)
+    today_switches = _session_log("_tier_switches_today")
+    _drop_before_day(today_switches, switch_log["timestamp"][:10])
+    today_switches.append(switch_log["timestamp"])
+    _bump_voice_state()
     
     # Log to agent memory
-    memory_key = f"{agent_name.lower()}_memory"
-    if memory_key in st.session_state:
-        agent_memory = st.session_state[memory_key]
-        
+    agent_memory = _agent_memory(agent_name)
+    if agent_memory is not None:
         voice_switch_entry = {
             "timestamp": switch_log["timestamp"],
             "action_type": "voice_tier_switch",
@@ -1887,6 +2257,7 @@ def update_voice_api_usage(voice_engine, chars_or_words_used):
     usage = st.session_state["voice_api_usage"][voice_engine]
     usage["requests_today"] += 1
     usage["tokens_used"] += chars_or_words_used
+    _bump_voice_state()
     
     return usage
 
@@ -1915,40 +2286,55 @@ def generate_agent_voice_output(agent_name, text_to_speak):
     # Update agent profile stats
     if agent_name in st.session_state.get("agent_voice_profiles", {}):
         profile = st.session_state["agent_voice_profiles"][agent_name]
-        profile["usage_stats"]["successful_generations"] += 1
+        profile.successful_generations += 1
     
     return voice_result
 
 def monitor_voice_system_health():
-    """Monitor overall voice system health and usage"""
-    voice_profiles = st.session_state.get("agent_voice_profiles", {})
-    voice_usage = st.session_state.get("voice_api_usage", {})
-    tier_switches = st.session_state.get("voice_tier_switches", [])
+    """Monitor overall voice system health and usage (cached until voice state changes or the day rolls over)"""
+    ss = st.session_state
+    now = datetime.now()
+    today = now.date()
+    today_iso = today.isoformat()
+    cache_key = (ss.get("_voice_state_version", 0), today)
+    cached = ss.get("_voice_health_cache")
+    if cached is not None and cached[0] == cache_key:
+        return cached[1]
+    
+    voice_profiles = ss.get("agent_voice_profiles", {})
+    voice_usage = ss.get("voice_api_usage", {})
+    today_switches = ss.get("_tier_switches_today")
+    if today_switches is not None:
+        _drop_before_day(today_switches, today_iso)
+        recent_switches = len(today_switches)
+    else:
+        # Switch timestamps are local isoformat strings, so the date is the 10-char prefix
+        recent_switches = sum(1 for s in ss.get("voice_tier_switches", ()) if s["timestamp"][:10] == today_iso)
     
     health_report = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now.isoformat(),
         "total_agents": len(voice_profiles),
         "tier_distribution": {},
         "quota_status": {},
-        "recent_switches": len([s for s in tier_switches if 
-                              _safe_dt(s["timestamp"]).date() == datetime.now().date()]),
+        "recent_switches": recent_switches,
         "system_status": "healthy"
     }
     
     # Analyze tier distribution
     for agent, profile in voice_profiles.items():
-        tier = profile["current_tier"] + 1
+        tier = profile.current_tier + 1
         health_report["tier_distribution"][f"tier_{tier}"] = health_report["tier_distribution"].get(f"tier_{tier}", 0) + 1
     
     # Check quota statuses
     for engine, usage in voice_usage.items():
-        quota_check = check_voice_api_quota(engine)
+        quota_check = check_voice_api_quota(engine, today_iso)
         health_report["quota_status"][engine] = {
             "available": quota_check["available"],
             "tier": get_tier_level(engine),
             "requests_today": usage.get("requests_today", 0)
         }
     
+    ss["_voice_health_cache"] = (cache_key, health_report)
     return health_report
 
 def configure_tiered_voice_system():
@@ -1971,12 +2357,13 @@ def configure_tiered_voice_system():
     
     # Enable voice system features
     st.session_state["voice_engine_failover_enabled"] = True
+    _set_voice_flags(VOICE_FAILOVER)
     st.session_state["voice_api_monitoring_enabled"] = True
     st.session_state["auto_voice_tier_switching"] = True
     st.session_state["voice_tier_logging_enabled"] = True
     
     # Enable voice output for all agents
-    agents = ["Jenny", "Luna", "Demo", "Cannon", "Bob the Builder", "Lexi", "Ava"]
+    agents = CORE_AGENTS
     for agent in agents:
         memory_key = create_agent_memory_space(agent)
         if memory_key in st.session_state:
@@ -1997,6 +2384,8 @@ def configure_tiered_voice_system():
 # CLOUD-CONNECTED RELAY CONTROL PANEL
 # =========================
 
+CLOUD_LOG_LIMIT = 2_000    # entries kept per cloud/remote log (access log, command/upload/voice history)
+
 def enable_relay_cloud_dashboard():
     """Initialize cloud dashboard infrastructure"""
     st.session_state.setdefault("cloud_dashboard_enabled", False)
@@ -2004,25 +2393,29 @@ def enable_relay_cloud_dashboard():
     st.session_state.setdefault("cloud_sync_status", "disconnected")
     st.session_state.setdefault("remote_devices", [])
     st.session_state.setdefault("cloud_authentication", {})
-    st.session_state.setdefault("cloud_access_log", [])
+    _session_log("cloud_access_log", CLOUD_LOG_LIMIT)
     
     # Generate unique session ID for this dashboard instance
-    import uuid
-    session_id = str(uuid.uuid4())[:8]
+    session_id = os.urandom(4).hex()
     st.session_state["cloud_session_id"] = session_id
     
     return f"✅ Cloud dashboard infrastructure initialized (Session: {session_id})"
 
-def secure_cloud_access_layer(user: str):
+def _cloud_access_log(log_buffer: list = None):
+    """Where access records go: the caller's batch buffer, or the session's cloud_access_log"""
+    return log_buffer if log_buffer is not None else _session_log("cloud_access_log", CLOUD_LOG_LIMIT)
+
+def secure_cloud_access_layer(user: str, log_buffer: list = None):
     """Implement secure authentication and access control"""
+    now_iso = datetime.now().isoformat()
     auth_config = {
         "user_id": user,
         "auth_methods": ["voiceprint", "device_auth", "pin"],
         "session_timeout": 3600,  # 1 hour
         "device_lockout_attempts": 3,
         "encryption_enabled": True,
-        "session_created": datetime.now().isoformat(),
-        "last_activity": datetime.now().isoformat(),
+        "session_created": now_iso,
+        "last_activity": now_iso,
         "authorized_devices": [],
         "security_level": "high"
     }
@@ -2031,25 +2424,26 @@ def secure_cloud_access_layer(user: str):
     
     # Log authentication setup
     auth_log = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now_iso,
         "action": "cloud_auth_configured",
         "user": user,
         "security_level": "high",
         "methods": auth_config["auth_methods"]
     }
-    st.session_state.setdefault("cloud_access_log", []).append(auth_log)
+    _cloud_access_log(log_buffer).append(auth_log)
     
     return f"✅ Secure cloud access configured for {user} with high security"
 
-def register_device_for_cloud_access(device_info):
+def register_device_for_cloud_access(device_info, log_buffer: list = None):
     """Register a device for cloud access"""
+    now_iso = datetime.now().isoformat()
     device_registration = {
         "device_id": device_info.get("device_id", "unknown"),
         "device_type": device_info.get("type", "browser"),
         "device_name": device_info.get("name", "Unknown Device"),
         "platform": device_info.get("platform", "web"),
-        "registered_at": datetime.now().isoformat(),
-        "last_seen": datetime.now().isoformat(),
+        "registered_at": now_iso,
+        "last_seen": now_iso,
         "status": "active",
         "permissions": device_info.get("permissions", ["read", "basic_control"])
     }
@@ -2058,18 +2452,19 @@ def register_device_for_cloud_access(device_info):
     
     # Log device registration
     registration_log = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now_iso,
         "action": "device_registered",
         "device_id": device_registration["device_id"],
         "device_type": device_registration["device_type"],
         "permissions": device_registration["permissions"]
     }
-    st.session_state.setdefault("cloud_access_log", []).append(registration_log)
+    _cloud_access_log(log_buffer).append(registration_log)
     
     return f"✅ Device {device_registration['device_name']} registered for cloud access"
 
 def authenticate_cloud_user(user_input):
     """Authenticate user with biometric verification"""
+    now_iso = datetime.now().isoformat()
     auth_config = st.session_state.get("cloud_authentication", {})
     
     # Simulate biometric verification (voiceprint matching)
@@ -2078,37 +2473,40 @@ def authenticate_cloud_user(user_input):
         "confidence_score": 0.95,
         "user_verified": True,
         "auth_method": "voiceprint",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now_iso
     }
     
     if verification_result["user_verified"]:
         # Update last activity
-        auth_config["last_activity"] = datetime.now().isoformat()
+        auth_config["last_activity"] = now_iso
         st.session_state["cloud_authentication"] = auth_config
         st.session_state["cloud_user_authenticated"] = True
         
         # Log successful authentication
         auth_log = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso,
             "action": "authentication_success",
             "method": verification_result["auth_method"],
             "confidence": verification_result["confidence_score"],
             "user": auth_config.get("user_id", "unknown")
         }
-        st.session_state.setdefault("cloud_access_log", []).append(auth_log)
+        _session_log("cloud_access_log", CLOUD_LOG_LIMIT).append(auth_log)
         
         return verification_result
     
     return {"user_verified": False, "error": "Authentication failed"}
 
+_AUTHORIZED_REMOTE_COMMANDS = frozenset({
+    "agent_status", "start_agent", "stop_agent", "send_message",
+    "check_memory", "update_config", "voice_command", "file_upload"
+})
+_REMOTE_UPLOAD_EXTENSIONS = frozenset({".txt", ".md", ".pdf", ".docx", ".jpg", ".png", ".wav", ".mp3"})
+
 def enable_remote_agent_control():
     """Enable remote control of agents across devices"""
     remote_control_config = {
         "enabled": True,
-        "authorized_commands": [
-            "agent_status", "start_agent", "stop_agent", "send_message", 
-            "check_memory", "update_config", "voice_command", "file_upload"
-        ],
+        "authorized_commands": _AUTHORIZED_REMOTE_COMMANDS,
         "security_validation": True,
         "command_logging": True,
         "cross_device_sync": True,
@@ -2119,7 +2517,7 @@ def enable_remote_agent_control():
     
     # Initialize remote command queue
     st.session_state.setdefault("remote_command_queue", [])
-    st.session_state.setdefault("remote_command_history", [])
+    _session_log("remote_command_history", CLOUD_LOG_LIMIT)
     
     return "✅ Remote agent control enabled with secure command processing"
 
@@ -2129,7 +2527,7 @@ def process_remote_command(command_data):
         return {"error": "Authentication required", "status": "denied"}
     
     # Validate command
-    authorized_commands = st.session_state.get("remote_agent_control", {}).get("authorized_commands", [])
+    authorized_commands = st.session_state.get("remote_agent_control", {}).get("authorized_commands", ())
     if command_data.get("command") not in authorized_commands:
         return {"error": "Unauthorized command", "status": "denied"}
     
@@ -2146,13 +2544,13 @@ def process_remote_command(command_data):
     # Execute based on command type
     if command_data["command"] == "agent_status":
         agent_name = command_data.get("agent", "Jenny")
-        memory_key = f"{agent_name.lower()}_memory"
-        if memory_key in st.session_state:
+        agent_memory = _agent_memory(agent_name)
+        if agent_memory is not None:
             status = {
                 "agent": agent_name,
                 "active": True,
-                "memory_entries": len(st.session_state[memory_key]["entries"]),
-                "last_activity": st.session_state[memory_key].get("last_activity", "unknown")
+                "memory_entries": len(agent_memory["entries"]),
+                "last_activity": agent_memory.get("last_activity", "unknown")
             }
             command_result["result"] = status
     
@@ -2164,23 +2562,21 @@ def process_remote_command(command_data):
         command_result["result"] = f"Message sent to {agent_name}"
     
     # Log command execution
-    st.session_state.setdefault("remote_command_history", []).append(command_result)
+    _session_log("remote_command_history", CLOUD_LOG_LIMIT).append(command_result)
     
     return command_result
 
 def sync_agent_status_to_cloud():
     """Synchronize agent status across devices"""
-    agents = ["Jenny", "Luna", "Demo", "Cannon", "Bob the Builder", "Lexi", "Ava"]
     agent_status_sync = {
         "sync_timestamp": datetime.now().isoformat(),
         "session_id": st.session_state.get("cloud_session_id", "unknown"),
         "agents": {}
     }
     
-    for agent in agents:
-        memory_key = f"{agent.lower()}_memory"
-        if memory_key in st.session_state:
-            agent_memory = st.session_state[memory_key]
+    for agent, memory_key in _CORE_AGENT_KEYS:
+        agent_memory = _agent_memory(agent, memory_key)
+        if agent_memory is not None:
             agent_status_sync["agents"][agent] = {
                 "active": True,
                 "memory_entries": len(agent_memory["entries"]),
@@ -2202,27 +2598,30 @@ def sync_agent_status_to_cloud():
 
 def sync_conversations_to_cloud():
     """Synchronize conversations and memory across devices"""
+    now_iso = datetime.now().isoformat()
     conversation_sync = {
-        "sync_timestamp": datetime.now().isoformat(),
+        "sync_timestamp": now_iso,
         "session_id": st.session_state.get("cloud_session_id", "unknown"),
         "conversations": {},
         "total_memory_entries": 0
     }
     
-    agents = ["Jenny", "Luna", "Demo", "Cannon", "Bob the Builder", "Lexi", "Ava"]
-    for agent in agents:
-        memory_key = f"{agent.lower()}_memory"
-        if memory_key in st.session_state:
-            agent_memory = st.session_state[memory_key]
-            # Get recent conversations (last 10 entries)
-            recent_entries = agent_memory["entries"][-10:] if len(agent_memory["entries"]) > 10 else agent_memory["entries"]
-            
+    total_memory_entries = 0
+    for agent, memory_key in _CORE_AGENT_KEYS:
+        agent_memory = _agent_memory(agent, memory_key)
+        if agent_memory is not None:
+            entries = agent_memory["entries"]
+            total_entries = len(entries)
+            # Recent conversations (last 10 entries) - shared references, not copies. Safe because
+            # entries are never modified after they are appended (see LogEntry); index ranges
+            # would go stale as the bounded deque evicts
             conversation_sync["conversations"][agent] = {
-                "recent_entries": recent_entries,
-                "total_entries": len(agent_memory["entries"]),
-                "last_sync": datetime.now().isoformat()
+                "recent_entries": list(islice(entries, max(0, total_entries - 10), total_entries)),
+                "total_entries": total_entries,
+                "last_sync": now_iso
             }
-            conversation_sync["total_memory_entries"] += len(agent_memory["entries"])
+            total_memory_entries += total_entries
+    conversation_sync["total_memory_entries"] = total_memory_entries
     
     st.session_state["cloud_conversation_sync"] = conversation_sync
     return "✅ Conversations synchronized to cloud"
@@ -2232,7 +2631,7 @@ def enable_remote_file_upload():
     upload_config = {
         "enabled": True,
         "max_file_size": 50 * 1024 * 1024,  # 50MB
-        "allowed_extensions": [".txt", ".md", ".pdf", ".docx", ".jpg", ".png", ".wav", ".mp3"],
+        "allowed_extensions": _REMOTE_UPLOAD_EXTENSIONS,
         "security_scanning": True,
         "auto_processing": True,
         "cloud_storage": True,
@@ -2241,8 +2640,9 @@ def enable_remote_file_upload():
     }
     
     st.session_state["remote_file_upload"] = upload_config
-    st.session_state.setdefault("remote_upload_queue", [])
-    st.session_state.setdefault("remote_upload_history", [])
+    _session_log("remote_upload_queue", CLOUD_LOG_LIMIT)
+    history = _session_log("remote_upload_history", CLOUD_LOG_LIMIT)
+    st.session_state.setdefault("remote_upload_counter", len(history))
     
     return "✅ Remote file upload processing enabled with security scanning"
 
@@ -2262,12 +2662,12 @@ def process_remote_file_upload(file_data, source_device):
     if file_size > upload_config.get("max_file_size", 0):
         return {"error": "File too large", "status": "rejected"}
     
-    if file_ext not in upload_config.get("allowed_extensions", []):
+    if file_ext not in upload_config.get("allowed_extensions", ()):
         return {"error": "File type not allowed", "status": "rejected"}
     
     # Process upload
     upload_result = {
-        "upload_id": f"remote_{len(st.session_state.get('remote_upload_history', []))}",
+        "upload_id": f"remote_{_next_seq('remote_upload_counter', 'remote_upload_history')}",
         "filename": file_data.get("filename", "unknown"),
         "size": file_size,
         "extension": file_ext,
@@ -2279,7 +2679,7 @@ def process_remote_file_upload(file_data, source_device):
     }
     
     # Add to processing queue
-    st.session_state.setdefault("remote_upload_queue", []).append(upload_result)
+    _session_log("remote_upload_queue", CLOUD_LOG_LIMIT).append(upload_result)
     
     # Auto-process if enabled
     if upload_config.get("auto_processing", False):
@@ -2290,15 +2690,23 @@ def process_remote_file_upload(file_data, source_device):
         log_file_uploaded(upload_result["filename"], upload_result["size"], "remote_upload")
     
     # Add to history
-    st.session_state.setdefault("remote_upload_history", []).append(upload_result)
+    _session_log("remote_upload_history", CLOUD_LOG_LIMIT).append(upload_result)
     
     return upload_result
 
+_REMOTE_WAKE_WORDS = ("Hey Jenny", "Hey Luna", "Hey Agents")
+
+@functools.lru_cache(maxsize=8)
+def _remote_wake_re(wake_words):
+    """Prefix matcher for a tuple of wake words (first listed wins, as with startswith)"""
+    # (?!) never matches, so an empty wake-word list matches nothing
+    return re.compile("|".join(map(re.escape, wake_words)) or "(?!)")
+
 def enable_remote_voice_commands():
     """Enable remote voice command routing"""
     voice_remote_config = {
         "enabled": True,
-        "wake_words": ["Hey Jenny", "Hey Luna", "Hey Agents"],
+        "wake_words": _REMOTE_WAKE_WORDS,
         "command_routing": True,
         "real_time_processing": True,
         "compression": "opus",
@@ -2308,8 +2716,9 @@ def enable_remote_voice_commands():
     }
     
     st.session_state["remote_voice_commands"] = voice_remote_config
-    st.session_state.setdefault("remote_voice_queue", [])
-    st.session_state.setdefault("remote_voice_history", [])
+    _session_log("remote_voice_queue", CLOUD_LOG_LIMIT)
+    history = _session_log("remote_voice_history", CLOUD_LOG_LIMIT)
+    st.session_state.setdefault("remote_voice_counter", len(history))
     
     return "✅ Remote voice command routing enabled with real-time processing"
 
@@ -2324,7 +2733,7 @@ def process_remote_voice_command(voice_data, source_device):
     
     # Process voice command
     voice_command = {
-        "command_id": f"remote_voice_{len(st.session_state.get('remote_voice_history', []))}",
+        "command_id": f"remote_voice_{_next_seq('remote_voice_counter', 'remote_voice_history')}",
         "transcribed_text": voice_data.get("text", ""),
         "source_device": source_device,
         "received_at": datetime.now().isoformat(),
@@ -2335,29 +2744,27 @@ def process_remote_voice_command(voice_data, source_device):
     # Route to voice processing system
     if voice_command["transcribed_text"]:
         # Check for wake words
-        wake_words = voice_config.get("wake_words", [])
-        for wake_word in wake_words:
-            if voice_command["transcribed_text"].startswith(wake_word):
-                # Process with enhanced voice system
-                if wake_word == "Hey Agents":
-                    result = process_group_voice_command(
-                        voice_command["transcribed_text"], 
-                        voice_command["received_at"],
-                        {"is_authorized": True, "user_id": "remote_user"}
-                    )
-                else:
-                    result = process_enhanced_voice_command(
-                        voice_command["transcribed_text"], 
-                        voice_command["received_at"],
-                        {"is_authorized": True, "user_id": "remote_user"}
-                    )
-                
-                voice_command["processed"] = True
-                voice_command["response"] = result.get("response", "Processed")
-                break
+        wake_match = _remote_wake_re(tuple(voice_config.get("wake_words", ()))).match(voice_command["transcribed_text"])
+        if wake_match:
+            # Process with enhanced voice system
+            if wake_match.group() == "Hey Agents":
+                result = process_group_voice_command(
+                    voice_command["transcribed_text"], 
+                    voice_command["received_at"],
+                    {"is_authorized": True, "user_id": "remote_user"}
+                )
+            else:
+                result = process_enhanced_voice_command(
+                    voice_command["transcribed_text"], 
+                    voice_command["received_at"],
+                    {"is_authorized": True, "user_id": "remote_user"}
+                )
+            
+            voice_command["processed"] = True
+            voice_command["response"] = result.get("response", "Processed")
     
     # Add to history
-    st.session_state.setdefault("remote_voice_history", []).append(voice_command)
+    _session_log("remote_voice_history", CLOUD_LOG_LIMIT).append(voice_command)
     
     return voice_command
 
@@ -2431,13 +2838,14 @@ def create_mobile_optimized_ui():
 def deploy_cloud_control_panel():
     """Deploy complete cloud-connected Relay control panel"""
     results = []
+    access_records = []  # written to cloud_access_log in one extend at the end
     
     # Initialize cloud dashboard
     dashboard_result = enable_relay_cloud_dashboard()
     results.append(dashboard_result)
     
     # Configure security
-    security_result = secure_cloud_access_layer("Joe_Budds")
+    security_result = secure_cloud_access_layer("Joe_Budds", access_records)
     results.append(security_result)
     
     # Enable remote control capabilities
@@ -2475,8 +2883,9 @@ def deploy_cloud_control_panel():
         "platform": "web",
         "permissions": ["read", "write", "admin", "voice", "file_upload"]
     }
-    device_result = register_device_for_cloud_access(current_device)
+    device_result = register_device_for_cloud_access(current_device, access_records)
     results.append(device_result)
+    _session_log("cloud_access_log", CLOUD_LOG_LIMIT).extend(access_records)
     
     results.append("✅ Cloud control panel fully deployed and operational")
     
@@ -2582,7 +2991,7 @@ def enable_idle_detection():
     st.session_state.setdefault("idle_behavior_log", [])
     
     # Initialize idle tracking for all agents
-    agents = ["Jenny", "Luna", "Demo", "Cannon", "Bob the Builder", "Lexi", "Ava"]
+    agents = CORE_AGENTS
     for agent in agents:
         st.session_state["agent_idle_status"][agent] = {
             "is_idle": False,
@@ -2603,9 +3012,8 @@ def check_agent_idle_status(agent_name):
     current_time = datetime.now()
     
     # Check last activity from agent memory
-    memory_key = f"{agent_name.lower()}_memory"
-    if memory_key in st.session_state:
-        agent_memory = st.session_state[memory_key]
+    agent_memory = _agent_memory(agent_name)
+    if agent_memory is not None:
         entries = agent_memory.get("entries", [])
         if entries:
             last_entry_time = entries[-1].get("timestamp", idle_status["last_activity"])
@@ -2694,10 +3102,9 @@ def find_collaboration_opportunities(idle_agent):
         agent_status = check_agent_idle_status(active_agent)
         if not agent_status["is_idle"]:
             # Check if active agent has recent tasks
-            memory_key = f"{active_agent.lower()}_memory"
-            if memory_key in st.session_state:
-                agent_memory = st.session_state[memory_key]
-                recent_entries = agent_memory.get("entries", [])[-3:]
+            agent_memory = _agent_memory(active_agent)
+            if agent_memory is not None:
+                recent_entries = _tail(agent_memory.get("entries", []), 3)
                 
                 if recent_entries:
                     opportunity = {
@@ -2745,9 +3152,9 @@ def calculate_assistance_priority(helper_agent, target_agent):
     }.get((helper_agent, target_agent), 10)
     
     # Recent activity bonus
-    memory_key = f"{target_agent.lower()}_memory"
-    if memory_key in st.session_state:
-        entries = st.session_state[memory_key].get("entries", [])
+    agent_memory = _agent_memory(target_agent)
+    if agent_memory is not None:
+        entries = agent_memory.get("entries", [])
         if entries:
             last_entry_time = entries[-1].get("timestamp", "")
             if last_entry_time:
@@ -2917,18 +3324,17 @@ def get_agent_skills(agent_name):
 
 def perform_memory_review(agent_name):
     """Agent reviews and organizes their own memory"""
-    memory_key = f"{agent_name.lower()}_memory"
-    if memory_key not in st.session_state:
+    agent_memory = _agent_memory(agent_name)
+    if agent_memory is None:
         return {"success": False, "reason": "No memory found"}
     
-    agent_memory = st.session_state[memory_key]
     entries = agent_memory.get("entries", [])
     
     if len(entries) < 5:
         return {"success": False, "reason": "Insufficient memory to review"}
     
     # Analyze memory patterns
-    recent_entries = entries[-10:]
+    recent_entries = _tail(entries, 10)
     action_types = [entry.get("action_type", "unknown") for entry in recent_entries]
     common_actions = max(set(action_types), key=action_types.count) if action_types else "none"
     
@@ -2998,18 +3404,17 @@ def perform_safe_data_gathering(agent_name):
 
 def prepare_helpful_summaries(agent_name):
     """Prepare useful summaries from existing data"""
-    memory_key = f"{agent_name.lower()}_memory"
-    if memory_key not in st.session_state:
+    agent_memory = _agent_memory(agent_name)
+    if agent_memory is None:
         return {"success": False, "reason": "No memory to summarize"}
     
-    agent_memory = st.session_state[memory_key]
     entries = agent_memory.get("entries", [])
     
     if len(entries) < 3:
         return {"success": False, "reason": "Insufficient data for summary"}
     
     # Create helpful summary
-    recent_entries = entries[-5:]
+    recent_entries = _tail(entries, 5)
     summary_content = f"📋 **Summary Prepared by {agent_name}**\n\n"
     summary_content += f"**Recent Activity Summary:**\n"
     
@@ -3071,11 +3476,10 @@ def scan_improvement_opportunities(agent_name):
 
 def organize_agent_knowledge(agent_name):
     """Organize and structure agent's knowledge base"""
-    memory_key = f"{agent_name.lower()}_memory"
-    if memory_key not in st.session_state:
+    agent_memory = _agent_memory(agent_name)
+    if agent_memory is None:
         return {"success": False, "reason": "No knowledge to organize"}
     
-    agent_memory = st.session_state[memory_key]
     entries = agent_memory.get("entries", [])
     
     if len(entries) < 5:
@@ -3175,9 +3579,9 @@ def log_autonomous_action(agent_name, action_result):
         "autonomous": True
     }
     
-    memory_key = f"{agent_name.lower()}_memory"
-    if memory_key in st.session_state:
-        st.session_state[memory_key]["entries"].append(memory_entry)
+    agent_memory = _agent_memory(agent_name)
+    if agent_memory is not None:
+        agent_memory["entries"].append(memory_entry)
     
     # Log to system idle behavior log
     system_log_entry = {
@@ -3206,7 +3610,7 @@ def log_all_idle_behavior_to_memory():
 
 def monitor_autonomous_system_health():
     """Monitor the health and performance of autonomous idle system"""
-    agents = ["Jenny", "Luna", "Demo", "Cannon", "Bob the Builder", "Lexi", "Ava"]
+    agents = CORE_AGENTS
     system_health = {
         "timestamp": datetime.now().isoformat(),
         "total_agents": len(agents),
@@ -3330,13 +3734,12 @@ def check_yesterday_activity(yesterday_date):
     ]
     
     # Check agent memories for activity
-    agents = ["Jenny", "Luna", "Demo", "Cannon", "Bob the Builder", "Lexi", "Ava"]
     yesterday_memory_entries = 0
     
-    for agent in agents:
-        memory_key = f"{agent.lower()}_memory"
-        if memory_key in st.session_state:
-            entries = st.session_state[memory_key].get("entries", [])
+    for agent, memory_key in _CORE_AGENT_KEYS:
+        agent_memory = _agent_memory(agent, memory_key)
+        if agent_memory is not None:
+            entries = agent_memory.get("entries", [])
             yesterday_entries = [
                 entry for entry in entries
                 if _safe_dt(entry.get("timestamp", "")).date() == yesterday_date
@@ -3419,13 +3822,11 @@ def compile_daily_briefing():
     }
     
     # Compile agent activities
-    agents = ["Jenny", "Luna", "Demo", "Cannon", "Bob the Builder", "Lexi", "Ava"]
     total_activities = 0
     
-    for agent in agents:
-        memory_key = f"{agent.lower()}_memory"
-        if memory_key in st.session_state:
-            agent_memory = st.session_state[memory_key]
+    for agent, memory_key in _CORE_AGENT_KEYS:
+        agent_memory = _agent_memory(agent, memory_key)
+        if agent_memory is not None:
             entries = agent_memory.get("entries", [])
             
             # Get yesterday's entries
@@ -0,0 +1,84 @@
+"""
+Batch task/specialty scoring for replaying routed tasks (e.g. from an audit log).
+
+Scores match the live router: an agent's score for a task is the fraction of
+its specialties with at least one word found in the lowercased task text.
+Live routing keeps the bitmask path in app.py; this is for scoring thousands
+of tasks at once. numba is optional - without it the same kernel runs as
+plain NumPy.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+
+def encode_specialties(specialties_by_agent):
+    """Encode {agent: [specialty, ...]} as (agents, vocab, words[A, S, W] int32, counts[A])
+
+    words holds vocab ids for each specialty's words, padded with -1.
+    """
+    agents = list(specialties_by_agent)
+    vocab = {}
+    split = [[tuple(s.replace("_", " ").split()) for s in specialties_by_agent[a]] for a in agents]
+    max_specs = max((len(specs) for specs in split), default=0)
+    max_words = max((len(words) for specs in split for words in specs), default=0)
+    words = np.full((len(agents), max(max_specs, 1), max(max_words, 1)), -1, dtype=np.int32)
+    for a, specs in enumerate(split):
+        for s, spec_words in enumerate(specs):
+            for w, word in enumerate(spec_words):
+                words[a, s, w] = vocab.setdefault(word, len(vocab))
+    counts = np.array([len(specs) for specs in split], dtype=np.int32)
+    return agents, list(vocab), words, counts
+
+
+def _word_hits(tasks, vocab):
+    """hits[T, V]: vocab word v occurs (as a substring) in lowercased task t"""
+    hits = np.zeros((len(tasks), len(vocab)), dtype=np.bool_)
+    for t, task in enumerate(tasks):
+        task_lower = task.lower()
+        for v, word in enumerate(vocab):
+            if word in task_lower:
+                hits[t, v] = True
+    return hits
+
+
+def _score_numpy(hits, words, counts):
+    padded = np.concatenate([hits, np.zeros((hits.shape[0], 1), dtype=np.bool_)], axis=1)
+    # -1 padding indexes the trailing all-False column
+    spec_hit = padded[:, words].any(axis=3)          # [T, A, S]
+    return (spec_hit.sum(axis=2) / np.maximum(counts, 1)).astype(np.float32)
+
+
+if HAVE_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _score_kernel(hits, words, counts):
+        n_tasks = hits.shape[0]
+        n_agents, n_specs, n_words = words.shape
+        out = np.zeros((n_tasks, n_agents), dtype=np.float32)
+        for t in prange(n_tasks):
+            for a in range(n_agents):
+                matched = 0
+                for s in range(n_specs):
+                    for w in range(n_words):
+                        v = words[a, s, w]
+                        if v >= 0 and hits[t, v]:
+                            matched += 1
+                            break
+                out[t, a] = matched / max(counts[a], 1)
+        return out
+else:
+    _score_kernel = _score_numpy
+
+
+def bulk_score_tasks(tasks, specialties_by_agent):
+    """Score many tasks against every agent -> (agents, scores[len(tasks), len(agents)] float32)"""
+    agents, vocab, words, counts = encode_specialties(specialties_by_agent)
+    hits = _word_hits(tasks, vocab)
+    if not len(tasks) or not agents:
+        return agents, np.zeros((len(tasks), len(agents)), dtype=np.float32)
+    return agents, _score_kernel(hits, words, counts)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Guard path checks and secret scanning"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import agent_fs_guard as afg
+
+
+@pytest.fixture
+def guard(tmp_path, monkeypatch):
+    allowed = tmp_path / "allowed"
+    outside = tmp_path / "outside"
+    allowed.mkdir(); outside.mkdir()
+    monkeypatch.setattr(afg, "AUDIT_LOG", tmp_path / "audit.log")
+    monkeypatch.setitem(afg.POLICY, "_test", {
+        "allowed_ops": {"read", "write"},
+        "allowed_roots": [str(allowed)],
+        "denied_roots": [],
+        "allowed_domains": [],
+    })
+    monkeypatch.setattr(afg, "_RESOLVED_POLICY", {})
+    return afg.Guard("_test"), allowed, outside
+
+
+def test_symlink_swap_is_rechecked(guard):
+    g, allowed, outside = guard
+    target = allowed / "notes.txt"
+    target.write_text("ok")
+    assert g.can_read(str(target))
+
+    target.unlink()
+    (outside / "secret.txt").write_text("nope")
+    target.symlink_to(outside / "secret.txt")
+    assert not g.can_read(str(target))
+
+
+SECRET_SAMPLES = [
+    ("openai key sk-" + "a" * 24, True),
+    ("aws AKIA" + "A" * 16, True),
+    ("google AIza" + "b" * 35, True),
+    ("anthropic_ab_" + "c" * 24, True),
+    ('API_KEY = "hunter2"', True),
+    ("token: 'abc'", True),
+    ("sk-short and AKIA123", False),
+    ("plain text, no keys here", False),
+    ("token = unquoted", False),
+]
+
+
+def _engine(builder):
+    def build():
+        try:
+            return builder()
+        except ImportError as e:
+            pytest.skip(f"optional engine not installed: {e}")
+    return build
+
+
+@pytest.fixture(params=[
+    pytest.param(lambda: None, id="re"),
+    pytest.param(_engine(afg._hyperscan_scanner), id="hyperscan"),
+    pytest.param(_engine(afg._re2_scanner), id="re2"),
+])
+def secret_engine(request, monkeypatch):
+    scan = request.param()
+    monkeypatch.setattr(afg, "_SECRET_SCAN", scan)
+    return scan
+
+
+@pytest.mark.parametrize("text,expected", SECRET_SAMPLES)
+def test_engines_agree_with_re(secret_engine, text, expected):
+    assert (afg._SECRET_UNION.search(text) is not None) == expected
+    assert afg.scan_text_for_secrets(text) == expected
+
+
+@pytest.mark.parametrize("text,expected", SECRET_SAMPLES)
+def test_file_scan_matches_text_scan(secret_engine, tmp_path, text, expected):
+    path = tmp_path / "sample.txt"
+    path.write_text(f"header\n{text}\nfooter\n")
+    assert afg.scan_file_for_secrets(str(path)) == expected
+
+
+def test_long_secret_across_old_chunk_edge(secret_engine, tmp_path):
+    # a quoted value far longer than any fixed overlap, straddling the 64 KiB mark
+    value = "x" * 4096
+    prefix = "a" * (64 * 1024 - 2048)
+    path = tmp_path / "big.txt"
+    path.write_text(f'{prefix}\nsecret = "{value}"\n')
+    assert afg.scan_file_for_secrets(str(path))
+
+
+def test_empty_file_has_no_secrets(secret_engine, tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+    assert not afg.scan_file_for_secrets(str(path))
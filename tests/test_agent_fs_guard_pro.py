@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Token persistence in the PRO guard, including writes from other processes"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import agent_fs_guard_pro as pro
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(pro, "TOKENS_PATH", tmp_path / "tokens_pro.json")
+    monkeypatch.setattr(pro, "REGISTRY_PATH", tmp_path / "agents.json")
+    monkeypatch.setattr(pro, "AUDIT_PATH", tmp_path / "audit.log")
+    monkeypatch.setattr(pro, "_tokens_cache", {"data": None, "stamp": None})
+    return tmp_path
+
+
+def _on_disk():
+    return json.loads(pro.TOKENS_PATH.read_text(encoding="utf-8"))
+
+
+def test_issue_and_revoke_reach_disk_immediately():
+    token, _ = pro.issue_token("Jenny")
+    assert token in _on_disk()
+    assert pro.check_token(token, "read", "Jenny")
+
+    assert pro.revoke_token(token)
+    assert _on_disk()[token]["revoked"] is True
+    assert not pro.check_token(token, "read", "Jenny")
+
+
+def test_tokens_from_another_process_are_kept():
+    mine, _ = pro.issue_token("Jenny")
+    theirs, info = "external-token", dict(_on_disk()[mine], agent="Luna")
+    # another process rewrites the file with its own token added
+    pro.TOKENS_PATH.write_text(json.dumps({**_on_disk(), theirs: info}), encoding="utf-8")
+
+    later, _ = pro.issue_token("Demo")
+    assert {mine, theirs, later} <= set(_on_disk())
+    assert pro.check_token(theirs, "read", "Luna")
+
+
+def test_revocation_by_another_process_is_honoured():
+    token, _ = pro.issue_token("Jenny")
+    assert pro.check_token(token, "read")
+    data = _on_disk()
+    data[token]["revoked"] = True
+    data["padding"] = {}  # change the size too, as a real rewrite would
+    pro.TOKENS_PATH.write_text(json.dumps(data), encoding="utf-8")
+    assert not pro.check_token(token, "read")
+
+
+def test_revoke_does_not_mutate_handed_out_dicts():
+    token, _ = pro.issue_token("Jenny")
+    before = pro.list_active_tokens()
+    pro.revoke_token(token)
+    assert before[token]["revoked"] is False
+    assert token not in pro.list_active_tokens()
+
+
+def test_audit_flush_survives_short_writes(monkeypatch):
+    real_write = pro.os.write
+    monkeypatch.setattr(pro.os, "write", lambda fd, data: real_write(fd, bytes(data[:7])))
+    pro._audit_close()  # start from no open fd so the patched AUDIT_PATH is used
+    for i in range(3):
+        pro._audit("probe", n=i)
+    pro._audit_close()
+    lines = pro.AUDIT_PATH.read_text(encoding="utf-8").splitlines()
+    probes = [json.loads(line) for line in lines if '"probe"' in line]
+    assert [p["n"] for p in probes] == [0, 1, 2]
+    assert pro._audit_fd is None
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Agent memory spaces: lazy activation and entry lifetime"""
+
+from importlib.util import spec_from_file_location, module_from_spec
+from pathlib import Path
+
+import pytest
+
+st = pytest.importorskip("streamlit")
+
+APP = Path(__file__).resolve().parent.parent / "app.py"
+
+
+@pytest.fixture(scope="module")
+def app():
+    spec = spec_from_file_location("app", str(APP))
+    mod = module_from_spec(spec); spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(autouse=True)
+def fresh_session(app):
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    yield
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+
+
+def _task(task_id="task_0"):
+    return {"id": task_id, "task": "scan the repo", "source": "user", "type": "security",
+            "timestamp": "2026-01-01T00:00:00"}
+
+
+def test_task_log_activates_pending_agent(app):
+    app.queue_agent_activation("Demo", capabilities=["scan"])
+    app.log_task_to_agent_memory("Demo", _task())
+
+    memory = st.session_state[app._memory_key("Demo")]
+    assert memory["logging_enabled"] and memory["routing_enabled"]
+    assert memory["capabilities"] == ["scan"]
+    assert [e["action_type"] for e in memory["entries"]] == ["task_assigned"]
+    assert "Demo" not in st.session_state["pending_agent_activations"]
+
+
+def test_voice_log_activates_pending_agent(app):
+    app.queue_agent_activation("Luna", accessible_agents=["Jenny"])
+    app.log_voice_command_to_agent_memory("Luna", {
+        "id": "voice_0", "timestamp": "2026-01-01T00:00:00", "original_text": "Hey Luna, post",
+        "command": "post", "intent": "social",
+    })
+
+    memory = st.session_state[app._memory_key("Luna")]
+    assert memory["logging_enabled"]
+    assert memory["accessible_agents"] == ["Jenny"]
+    assert len(memory["entries"]) == 1
+
+
+def test_creating_a_space_applies_queued_settings(app):
+    app.queue_agent_activation("Cannon", memory_space_name="cannon_memory")
+    memory = st.session_state[app.create_agent_memory_space("Cannon")]
+    assert memory["logging_enabled"]
+    assert memory["memory_space_name"] == "cannon_memory"
+
+
+def test_cloud_sync_sees_pending_agents(app):
+    app.queue_agent_activation("Jenny")
+    app.sync_agent_status_to_cloud()
+    assert app._memory_key("Jenny") in st.session_state
+
+
+def test_evicted_entries_are_not_reused(app):
+    app.enable_memory_logging("Jenny")
+    for i in range(app.MEMORY_ENTRY_LIMIT):
+        app.log_to_agent_memory("Jenny", f"message {i}")
+    kept = app.get_agent_memory("Jenny", limit=1)[0]
+    assert kept["content"] == f"message {app.MEMORY_ENTRY_LIMIT - 1}"
+
+    for i in range(app.MEMORY_ENTRY_LIMIT):
+        app.log_to_agent_memory("Jenny", f"later {i}")
+    assert kept["content"] == f"message {app.MEMORY_ENTRY_LIMIT - 1}"
+    assert kept not in st.session_state[app._memory_key("Jenny")]["entries"]
+
+
+def test_cloud_conversation_snapshot_is_stable(app):
+    app.enable_memory_logging("Jenny")
+    for i in range(app.MEMORY_ENTRY_LIMIT):
+        app.log_to_agent_memory("Jenny", f"message {i}")
+    app.sync_conversations_to_cloud()
+    snapshot = st.session_state["cloud_conversation_sync"]["conversations"]["Jenny"]
+    before = [e["content"] for e in snapshot["recent_entries"]]
+
+    for i in range(app.MEMORY_ENTRY_LIMIT):
+        app.log_to_agent_memory("Jenny", f"later {i}")
+    assert [e["content"] for e in snapshot["recent_entries"]] == before
+    assert before[-1] == f"message {app.MEMORY_ENTRY_LIMIT - 1}"
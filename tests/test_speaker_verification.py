@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""verify_speaker_identity input handling"""
+
+import io
+from importlib.util import spec_from_file_location, module_from_spec
+from pathlib import Path
+
+import pytest
+
+st = pytest.importorskip("streamlit")
+np = pytest.importorskip("numpy")
+
+APP = Path(__file__).resolve().parent.parent / "app.py"
+
+
+@pytest.fixture(scope="module")
+def app():
+    spec = spec_from_file_location("app", str(APP))
+    mod = module_from_spec(spec); spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(autouse=True)
+def enrolled(app):
+    for key in list(st.session_state.keys()):
+        del st.session_state[key]
+    app.enable_voice_identification("Joe_Budds", reference_embedding=[1.0, 0.0, 0.0])
+
+
+def test_embedding_is_scored(app):
+    assert app.verify_speaker_identity(np.array([1.0, 0.0, 0.0]))["is_authorized"]
+    assert not app.verify_speaker_identity([0.0, 1.0, 0.0])["is_authorized"]
+
+
+def test_file_like_upload_uses_placeholder_path(app):
+    result = app.verify_speaker_identity(io.BytesIO(b"RIFF...."))
+    assert result["verification_method"] == "voiceprint_match"
+
+
+def test_malformed_embedding_is_rejected(app):
+    for sample in ([1.0, 0.0], ["a", "b", "c"]):
+        result = app.verify_speaker_identity(sample)
+        assert result["verification_method"] == "embedding_cosine"
+        assert not result["is_authorized"]
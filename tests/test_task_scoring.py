@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Batch specialty scoring must agree with live routing"""
+
+import sys
+from importlib.util import spec_from_file_location, module_from_spec
+from pathlib import Path
+
+import pytest
+
+st = pytest.importorskip("streamlit")
+pytest.importorskip("numpy")
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+import task_scoring
+
+TASKS = [
+    "Scan the API for vulnerability and zero day issues",
+    "Schedule a calendar invite and track email replies",
+    "Run the automation script for command execution",
+    "Review the contract for compliance with the policy",
+    "Wire up the api and deploy the app",
+    "write a haiku",
+]
+
+
+@pytest.fixture(scope="module")
+def app():
+    spec = spec_from_file_location("app", str(ROOT / "app.py"))
+    mod = module_from_spec(spec); spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(params=["numpy", "numba"])
+def kernel(request, monkeypatch):
+    if request.param == "numba":
+        if not task_scoring.HAVE_NUMBA:
+            pytest.skip("numba not installed")
+    else:
+        monkeypatch.setattr(task_scoring, "_score_kernel", task_scoring._score_numpy)
+    return request.param
+
+
+def test_bulk_scores_match_find_better_agent(app, kernel):
+    agents, scores = app.bulk_score_tasks(TASKS)
+    assert scores.shape == (len(TASKS), len(agents))
+
+    for t, task in enumerate(TASKS):
+        for current in agents:
+            live = app.find_better_agent_for_task(task, current)
+            others = [(scores[t, a], agent) for a, agent in enumerate(agents) if agent != current]
+            best_score = max(score for score, _ in others)
+            if live is None:
+                assert best_score <= 0.3 + 1e-6
+            else:
+                assert scores[t, agents.index(live["agent"])] == pytest.approx(live["score"])
+                assert live["score"] == pytest.approx(best_score)
+
+
+def test_empty_batch(app, kernel):
+    agents, scores = app.bulk_score_tasks([])
+    assert scores.shape == (0, len(agents))
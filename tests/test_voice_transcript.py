@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Splitting a transcript into one voice intent per wake word"""
+
+from importlib.util import spec_from_file_location, module_from_spec
+from pathlib import Path
+
+import pytest
+
+st = pytest.importorskip("streamlit")
+
+APP = Path(__file__).resolve().parent.parent / "app.py"
+
+TRANSCRIPT = ("Hey Jenny, post the launch update. Luna schedule a meeting tomorrow. "
+              "Then Demo scan the server for vulnerabilities. Bobby said hi.")
+
+
+@pytest.fixture(scope="module")
+def app():
+    spec = spec_from_file_location("app", str(APP))
+    mod = module_from_spec(spec); spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(params=["regex", "ahocorasick"])
+def wake_engine(request, app, monkeypatch):
+    automaton = None
+    if request.param == "ahocorasick":
+        automaton = app._build_wake_automaton()
+        if automaton is None:
+            pytest.skip("pyahocorasick not installed")
+    monkeypatch.setattr(app, "_WAKE_AUTOMATON", automaton)
+    return request.param
+
+
+def test_multi_wake_word_transcript_is_split(app, wake_engine):
+    intents = app.parse_voice_transcript(TRANSCRIPT)
+    assert [i["target_agent"] for i in intents] == ["Jenny", "Luna", "Demo"]
+    assert intents[0]["command"] == "post the launch update."
+    # "bobby" is not the wake word "bob", so the last segment runs to the end
+    assert intents[-1]["command"].endswith("bobby said hi.")
+
+
+def test_engines_find_the_same_offsets(app, wake_engine):
+    text = TRANSCRIPT.lower()
+    assert app._wake_word_offsets(text) == [m.start() for m in app._WAKE_SCAN_RE.finditer(text)]
+
+
+def test_text_before_the_first_wake_word_is_dropped(app, wake_engine):
+    assert app.parse_voice_transcript("post the launch update") == []
+    intents = app.parse_voice_transcript("um, so. Luna schedule a meeting")
+    assert [i["target_agent"] for i in intents] == ["Luna"]
@@ -0,0 +1,25 @@
+"""
+Voiceprint comparison for speaker verification.
+
+Embeddings are compared by cosine similarity: the enrolled reference is
+L2-normalized to float32 once at enrollment, so each verification is one
+normalize + one dot product (BLAS sdot) on the candidate embedding.
+Embedding extraction itself is not done here.
+"""
+
+import numpy as np
+
+# Cosine score at or above which a candidate counts as the enrolled speaker
+MATCH_THRESHOLD = 0.75
+
+
+def normalize_embedding(embedding):
+    """Contiguous float32 unit vector for an embedding (zero vectors stay zero)"""
+    vec = np.ascontiguousarray(embedding, dtype=np.float32).ravel()
+    norm = float(np.linalg.norm(vec))
+    return vec / norm if norm else vec
+
+
+def cosine_score(reference_unit, embedding):
+    """Cosine similarity of a candidate embedding against a normalized reference"""
+    return float(reference_unit @ normalize_embedding(embedding))